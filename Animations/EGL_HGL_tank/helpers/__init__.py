@@ -2,12 +2,15 @@
 
 This package contains modular helpers for:
 - config: Configuration loading
-- physics: EGL/HGL calculations
 - geometry: Tank/pipe creation
 - labels: Labels, annotations, symbols, and reference lines
+
+EGL/HGL calculations come from the shared hydraulics package.
 """
+from hydraulics.cache import ConfigCache
+from hydraulics.profiles import calculate_egl_hgl
+
 from .config import load_config
-from .physics import calculate_egl_hgl
 from .geometry import (
     create_components, create_fluid_body, create_walls, create_tank_extensions
 )
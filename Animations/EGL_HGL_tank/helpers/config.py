@@ -1,15 +1,15 @@
 """Configuration loading utilities."""
-import yaml
+from hydraulics.cache import load_yaml
 
 
-def load_config(config_path):
-    """Loads a YAML configuration file.
+def load_config(config_path, required=()):
+    """Loads a YAML configuration file (cached next to it, see hydraulics.cache).
 
     Args:
         config_path (str): The absolute path to the YAML configuration file.
+        required (tuple): Top-level sections the file must define.
 
     Returns:
         dict: The configuration dictionary loaded from the file.
     """
-    with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+    return load_yaml(config_path, required)
@@ -8,19 +8,24 @@ import numpy as np
 import os
 import sys
 
-# Ensure we can import from the same directory
+# Import helpers/ from this folder and the shared hydraulics package and
+# render_profiles from the Animations folder above it
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from helpers import (
-    load_config, calculate_egl_hgl, create_aligned_label, create_velocity_head_annotation,
+    ConfigCache, calculate_egl_hgl, create_aligned_label, create_velocity_head_annotation,
     create_components, create_fluid_body, create_walls, create_tank_extensions,
     create_rotated_pipe_label, create_water_symbol, create_datum_line, create_flow_path
 )
+from render_profiles import apply_profile
 
 # --- Configuration ---
 script_dir = os.path.dirname(os.path.abspath(__file__))
-INPUTS = load_config(os.path.join(script_dir, 'inputs.yaml'))
+CACHE = ConfigCache(os.path.join(script_dir, 'inputs.yaml'), required=('scenes', 'global'))
+INPUTS = CACHE.config
 GLOBAL_INPUTS = INPUTS['global']
+PROFILE = apply_profile(config)
 
 
 class EGL_HGL_Tank(Scene):
@@ -82,8 +87,9 @@ class EGL_HGL_Tank(Scene):
             cfg['pipes']['pipe3'].get('minor_loss_k', 0)
         ]
         
-        # Calculate EGL/HGL
-        egl_pts, hgl_pts = calculate_egl_hgl(
+        # Calculate EGL/HGL (cached; the animated diameters below are recomputed per frame)
+        egl_pts, hgl_pts = CACHE.get(
+            'egl_hgl', calculate_egl_hgl,
             points=cfg['flow_path']['points'][1:-1],
             diameters=diameters,
             initial_head=hyd['initial_head'],
@@ -158,10 +164,13 @@ class EGL_HGL_Tank(Scene):
             lbl_p3.move_to(p3_center + DOWN * (d3/2 + visual_buff))
             
             # Update Pipe 3 dimension value (convert ft to inches for display)
-            d3_inches = d3 * 12  # Convert feet to inches
-            new_dim_p3 = Tex(f'{d3_inches:.1f}"', font_size=150, color=BLACK)
-            new_dim_p3.move_to(p3_center + UP * (d3/2 + visual_buff))
-            dim_p3.become(new_dim_p3)
+            if PROFILE.annotations:
+                d3_inches = d3 * 12  # Convert feet to inches
+                new_dim_p3 = Tex(f'{d3_inches:.1f}"', font_size=150, color=BLACK)
+                new_dim_p3.move_to(p3_center + UP * (d3/2 + visual_buff))
+                dim_p3.become(new_dim_p3)
+            else:
+                dim_p3.move_to(p3_center + UP * (d3/2 + visual_buff))
             
             # Also update background rectangle position
             lbl_p3_bg.move_to(lbl_p3.get_center())
@@ -208,53 +217,55 @@ class EGL_HGL_Tank(Scene):
         e_pts = egl_visual_pts
         h_pts = hgl_visual_pts
         
-        v_head_1 = make_velocity_annotation(
-            e_pts[0] + (e_pts[1] - e_pts[0]) * 0.25, h_pts[0] + (h_pts[1] - h_pts[0]) * 0.25, p1_d, 0, phys
-        )
-        v_head_2 = make_velocity_annotation(
-            e_pts[2] + (e_pts[3] - e_pts[2]) * 0.25, h_pts[2] + (h_pts[3] - h_pts[2]) * 0.25, p2_d, 1, phys
-        )
-        v_head_3 = make_velocity_annotation(
-            e_pts[4] + (e_pts[5] - e_pts[4]) * 0.25, h_pts[4] + (h_pts[5] - h_pts[4]) * 0.25, p3_d, 2, phys
-        )
+        # The V^2/2g labels are MathTex rebuilt every frame; drafts leave them out
+        if PROFILE.annotations:
+            v_head_1 = make_velocity_annotation(
+                e_pts[0] + (e_pts[1] - e_pts[0]) * 0.25, h_pts[0] + (h_pts[1] - h_pts[0]) * 0.25, p1_d, 0, phys
+            )
+            v_head_2 = make_velocity_annotation(
+                e_pts[2] + (e_pts[3] - e_pts[2]) * 0.25, h_pts[2] + (h_pts[3] - h_pts[2]) * 0.25, p2_d, 1, phys
+            )
+            v_head_3 = make_velocity_annotation(
+                e_pts[4] + (e_pts[5] - e_pts[4]) * 0.25, h_pts[4] + (h_pts[5] - h_pts[4]) * 0.25, p3_d, 2, phys
+            )
         
-        v_heads = VGroup(v_head_1, v_head_2, v_head_3)
+            v_heads = VGroup(v_head_1, v_head_2, v_head_3)
         
-        # Animate each equation appearing with Write animation
-        self.play(
-            Write(v_head_1),
-            Write(v_head_2),
-            Write(v_head_3),
-            lag_ratio=0.3,
-            run_time=2
-        )
+            # Animate each equation appearing with Write animation
+            self.play(
+                Write(v_head_1),
+                Write(v_head_2),
+                Write(v_head_3),
+                lag_ratio=0.3,
+                run_time=2
+            )
         
-        # Now add updater for dynamic changes
-        def update_v_heads(mob):
-            d3 = p3_tracker.get_value()
-            current_diameters = [p1_d, p2_d, d3]
+            # Now add updater for dynamic changes
+            def update_v_heads(mob):
+                d3 = p3_tracker.get_value()
+                current_diameters = [p1_d, p2_d, d3]
             
-            egl, hgl = calculate_egl_hgl(
-                points=cfg['flow_path']['points'][1:-1],
-                diameters=current_diameters,
-                initial_head=hyd['initial_head'],
-                gravity=phys['gravity'],
-                friction_factor=hyd['friction_factor'],
-                flow_rate=flow_rate,
-                minor_loss_coefficients=k_coefficients
-            )
-            new_e_pts = [plane.c2p(*p) for p in egl]
-            new_h_pts = [plane.c2p(*p) for p in hgl]
+                egl, hgl = calculate_egl_hgl(
+                    points=cfg['flow_path']['points'][1:-1],
+                    diameters=current_diameters,
+                    initial_head=hyd['initial_head'],
+                    gravity=phys['gravity'],
+                    friction_factor=hyd['friction_factor'],
+                    flow_rate=flow_rate,
+                    minor_loss_coefficients=k_coefficients
+                )
+                new_e_pts = [plane.c2p(*p) for p in egl]
+                new_h_pts = [plane.c2p(*p) for p in hgl]
             
-            new_group = VGroup(
-                make_velocity_annotation(new_e_pts[0] + (new_e_pts[1] - new_e_pts[0]) * 0.25, new_h_pts[0] + (new_h_pts[1] - new_h_pts[0]) * 0.25, p1_d, 0, phys),
-                make_velocity_annotation(new_e_pts[2] + (new_e_pts[3] - new_e_pts[2]) * 0.25, new_h_pts[2] + (new_h_pts[3] - new_h_pts[2]) * 0.25, p2_d, 1, phys),
-                make_velocity_annotation(new_e_pts[4] + (new_e_pts[5] - new_e_pts[4]) * 0.25, new_h_pts[4] + (new_h_pts[5] - new_h_pts[4]) * 0.25, d3, 2, phys)
-            )
-            mob.become(new_group)
-        
-        v_heads.add_updater(update_v_heads)
-        self.add(v_heads)  # Ensure VGroup is added to scene for updater to work
+                new_group = VGroup(
+                    make_velocity_annotation(new_e_pts[0] + (new_e_pts[1] - new_e_pts[0]) * 0.25, new_h_pts[0] + (new_h_pts[1] - new_h_pts[0]) * 0.25, p1_d, 0, phys),
+                    make_velocity_annotation(new_e_pts[2] + (new_e_pts[3] - new_e_pts[2]) * 0.25, new_h_pts[2] + (new_h_pts[3] - new_h_pts[2]) * 0.25, p2_d, 1, phys),
+                    make_velocity_annotation(new_e_pts[4] + (new_e_pts[5] - new_e_pts[4]) * 0.25, new_h_pts[4] + (new_h_pts[5] - new_h_pts[4]) * 0.25, d3, 2, phys)
+                )
+                mob.become(new_group)
+        
+            v_heads.add_updater(update_v_heads)
+            self.add(v_heads)  # Ensure VGroup is added to scene for updater to work
         
         # Animate diameter change (repeat twice)
         self.play(p3_tracker.animate.set_value(p3_d * 1.5), run_time=2)
@@ -1,4 +1,52 @@
+from collections.abc import MutableMapping
+
 import numpy as np
+import scipy.sparse as sp
+
+from hydraulics.acceleration import AndersonAccelerator
+from hydraulics.loops import fundamental_loops
+
+
+def detect_loops(config):
+    """
+    Builds a `network.loops` mapping automatically from the pipe topology.
+
+    Returns:
+        dict: {"Loop i": [pipe ids in traversal order]}, usable wherever a
+            hand-written loops section is expected.
+    """
+    pipes = config['network']['pipes']
+    pipe_ids = list(pipes)
+    labels = {}
+    for pid in pipe_ids:
+        for node in (pipes[pid]['start'], pipes[pid]['end']):
+            labels.setdefault(node, len(labels))
+    starts = [labels[pipes[pid]['start']] for pid in pipe_ids]
+    ends = [labels[pipes[pid]['end']] for pid in pipe_ids]
+    loops = fundamental_loops(len(labels), starts, ends)
+    return {f"Loop {i + 1}": [pipe_ids[p] for p, _ in loop] for i, loop in enumerate(loops)}
+
+
+class _FlowMap(MutableMapping):
+    """Dict view of a solver's flow array keyed by pipe ID; writes go to the array."""
+    def __init__(self, solver):
+        self._solver = solver
+
+    def __getitem__(self, pipe_id):
+        return float(self._solver.flows[self._solver.pipe_index[pipe_id]])
+
+    def __setitem__(self, pipe_id, flow):
+        self._solver.flows[self._solver.pipe_index[pipe_id]] = flow
+
+    def __delitem__(self, pipe_id):
+        raise TypeError("Pipes cannot be removed from a solver")
+
+    def __iter__(self):
+        return iter(self._solver.pipe_ids)
+
+    def __len__(self):
+        return len(self._solver.pipe_ids)
+
 
 class HardyCrossSolver:
     """
@@ -7,109 +55,212 @@ class HardyCrossSolver:
     def __init__(self, config):
         self.config = config
         self.pipes = config['network']['pipes']
-        self.loops = config['network']['loops']
-        # Map pipe IDs to their current flow
-        self.current_flows = {pid: data.get('initial_flow', 0) for pid, data in self.pipes.items()}
+        # Fall back to automatic loop detection when no loops are given
+        self.loops = config['network'].get('loops') or detect_loops(config)
+        # Pipe IDs fix the order of the flow/resistance arrays
+        self.pipe_ids = list(self.pipes)
+        self.pipe_index = {pid: i for i, pid in enumerate(self.pipe_ids)}
+        self.flows = np.array([self.pipes[pid].get('initial_flow', 0) for pid in self.pipe_ids], dtype=float)
+        self.resistance_array = np.array([self.pipes[pid].get('resistance', 1) for pid in self.pipe_ids], dtype=float)
         # Map pipe IDs to resistance
-        self.resistances = {pid: data.get('resistance', 1) for pid, data in self.pipes.items()}
+        self.resistances = dict(zip(self.pipe_ids, self.resistance_array))
+        self.compile_loops()
+
+    @property
+    def current_flows(self):
+        """Map pipe IDs to their current flow; item assignment updates the flow array."""
+        return _FlowMap(self)
+
+    @current_flows.setter
+    def current_flows(self, flows):
+        for pipe_id, flow in flows.items():
+            self.flows[self.pipe_index[pipe_id]] = flow
 
     def get_flow(self, pipe_id):
-        return self.current_flows.get(pipe_id, 0)
+        i = self.pipe_index.get(pipe_id)
+        return 0 if i is None else float(self.flows[i])
 
     def calculate_head_loss(self, flow, k, n=2):
         # hf = k * Q * |Q|^(n-1) -> for n=2, k * Q * |Q|
         return k * flow * abs(flow)**(n-1)
 
-    def solve_iteration(self, n=2):
+    def _loop_directions(self, pipe_ids):
+        """
+        Walks a loop in the listed order and returns {pipe_id: direction}
+        (+1 with the pipe definition, -1 against), or None if the loop
+        cannot be traversed.
+        """
+        # 1. Determine Start Node for traversal
+        # We assume connected pipes.
+        if len(pipe_ids) < 2: return None
+
+        p0_id = pipe_ids[0]
+        p0 = self.pipes[p0_id]
+        p1 = self.pipes[pipe_ids[1]]
+
+        # Intersection of P0 and P1
+        nodes0 = {p0['start'], p0['end']}
+        nodes1 = {p1['start'], p1['end']}
+        shared = list(nodes0.intersection(nodes1))
+
+        if not shared: return None
+        shared_node = shared[0] # node B
+
+        # Start node is the other node of P0
+        if p0['start'] == shared_node:
+            curr_node = p0['end']
+        else:
+            curr_node = p0['start']
+
+        # 2. Traverse Loop
+        pipe_directions = {} # pid -> direction (+1 or -1)
+
+        for pid in pipe_ids:
+            data = self.pipes[pid]
+            start, end = data['start'], data['end']
+
+            # Determine direction relative to traversal
+            if curr_node == start:
+                target = end
+                direction = 1 # Moving with pipe def
+            elif curr_node == end:
+                target = start
+                direction = -1 # Moving against pipe def
+            else:
+                direction = 1 # Warning
+                target = end
+
+            pipe_directions[pid] = direction
+            curr_node = target
+
+        return pipe_directions
+
+    def compile_loops(self):
+        """
+        Turns `self.loops` into signed index arrays once, so iterations only
+        do numerical work. Call again if the loop definitions change.
+
+        Builds:
+            compiled_loops: [(loop_id, pipe_indices, directions)] for every
+                traversable loop.
+            incidence: Signed loop-pipe incidence matrix, one row per
+                compiled loop (compiled loops x pipes).
+        """
+        self.compiled_loops = []
+        rows, cols, vals = [], [], []
+        for loop_id, pipe_ids in self.loops.items():
+            pipe_directions = self._loop_directions(pipe_ids)
+            if pipe_directions is None: continue
+            idx = np.array([self.pipe_index[pid] for pid in pipe_directions], dtype=int)
+            direction = np.array(list(pipe_directions.values()), dtype=float)
+            row = len(self.compiled_loops)
+            self.compiled_loops.append((loop_id, idx, direction))
+            rows.extend([row] * len(idx))
+            cols.extend(idx)
+            vals.extend(direction)
+        self.incidence = sp.csr_matrix((vals, (rows, cols)), shape=(len(self.compiled_loops), len(self.pipe_ids)))
+
+    def solve_iteration(self, n=2, simultaneous=False, relaxation=1.0):
         """
         Calculates and applies one iteration of Hardy Cross correction on all loops.
         Returns a dictionary of {loop_id: delta_q} containing the corrections applied.
-        Note: Corrections are calculated based on current state at the start of loop processing.
-        Usually, updates are applied loop-by-loop or simultaneously.
-        Here we will process loop-by-loop and update immediately as is common.
+
+        By default loops are processed one by one and each correction is
+        applied immediately, as is common. With simultaneous=True every
+        loop's correction is computed from the same flow state and applied
+        together (Jacobi style), scaled by `relaxation` (< 1 under-relaxes):
+
+            dQ = -(M h) / (|M| n r |Q|^(n-1)),   Q += relaxation * M^T dQ
+
+        where M is the signed loop-pipe incidence matrix.
         """
-        loop_corrections = {}
-        
-        for loop_id, pipe_ids in self.loops.items():
-            numerator = 0.0
-            denominator = 0.0
-            
-            # 1. Determine Start Node for traversal
-            # We assume connected pipes.
-            if len(pipe_ids) < 2: continue
-
-            p0_id = pipe_ids[0]
-            p0 = self.pipes[p0_id]
-            p1 = self.pipes[pipe_ids[1]]
-            
-            # Intersection of P0 and P1
-            nodes0 = {p0['start'], p0['end']}
-            nodes1 = {p1['start'], p1['end']}
-            shared = list(nodes0.intersection(nodes1))
-            
-            if not shared: continue
-            shared_node = shared[0] # node B
-            
-            # Start node is the other node of P0
-            if p0['start'] == shared_node:
-                curr_node = p0['end'] 
-            else:
-                curr_node = p0['start']
-            
-            # 2. Traverse Loop
-            # Store directions for update step
-            pipe_directions = {} # pid -> direction (+1 or -1)
-
-            for pid in pipe_ids:
-                data = self.pipes[pid]
-                start, end = data['start'], data['end']
-                
-                # Determine direction relative to traversal
-                if curr_node == start:
-                    target = end
-                    direction = 1 # Moving with pipe def
-                elif curr_node == end:
-                    target = start
-                    direction = -1 # Moving against pipe def
-                else:
-                    direction = 1 # Warning
-                    target = end
-                
-                pipe_directions[pid] = direction
-                curr_node = target
-                
-                # Calculation
-                q = self.current_flows[pid]
-                r = self.resistances[pid]
-                
-                # Flow relative to loop = q * direction
-                q_loop = q * direction
-                
-                # Head Loss = r * q_loop * |q_loop|^(n-1)
-                h_loss = r * q_loop * abs(q_loop)**(n-1)
-                
-                # Deriv = n * r * |q_loop|^(n-1)
-                deriv = n * r * abs(q_loop)**(n-1)
-                
-                numerator += h_loss
-                denominator += deriv
-            
-            # 3. Calculate Correction
-            if denominator == 0:
-                delta_q = 0
-            else:
-                delta_q = - numerator / denominator
-                
-            loop_corrections[loop_id] = delta_q
-            
-            # 4. Apply Correction Immediately
-            for pid in pipe_ids:
-                direction = pipe_directions[pid]
-                # If loop flow is delta_q (clockwise), and pipe is traversed with direction,
-                # we add delta_q. If traversed against, we add delta_q * (-1)?
-                # Wait: delta_q is Circulation correction.
-                # If pipe traversal is clockwise (direction relative to pipe def),
-                # New Flow = Old Flow + delta_q * direction
-                self.current_flows[pid] += delta_q * direction
-                
-        return loop_corrections
+        if simultaneous:
+            return self._solve_simultaneous(n, relaxation)
+
+        return {loop_id: self.correct_loop(idx, direction, n)
+                for loop_id, idx, direction in self.compiled_loops}
+
+    def correct_loop(self, idx, direction, n=2):
+        """
+        Computes and applies the Hardy Cross correction of one compiled loop
+        (pipe indices and directions as in compiled_loops).
+        Returns the correction delta_q.
+        """
+        # Flow relative to loop = q * direction
+        q_loop = self.flows[idx] * direction
+        r = self.resistance_array[idx]
+
+        # Head Loss = r * q_loop * |q_loop|^(n-1)
+        numerator = (r * q_loop * np.abs(q_loop)**(n-1)).sum()
+        # Deriv = n * r * |q_loop|^(n-1)
+        denominator = (n * r * np.abs(q_loop)**(n-1)).sum()
+
+        # Calculate Correction
+        if denominator == 0:
+            delta_q = 0
+        else:
+            delta_q = - numerator / denominator
+
+        # Apply Correction Immediately
+        # delta_q is a circulation correction around the loop:
+        # New Flow = Old Flow + delta_q * direction
+        self.flows[idx] += delta_q * direction
+
+        return float(delta_q)
+
+    def solve(self, max_iter=100, tol=1e-6, n=2, simultaneous=False, relaxation=1.0, anderson=0):
+        """
+        Runs solve_iteration until every loop correction is below `tol`.
+
+        With anderson=m > 0 each iteration is treated as a fixed-point map
+        on the flow vector and Anderson mixing over the last m iterates
+        picks the next flows.
+
+        Returns:
+            list: ΔQ history, one {loop_id: delta_q} dict per iteration.
+        """
+        accelerator = AndersonAccelerator(memory=anderson) if anderson else None
+        history = []
+        for _ in range(max_iter):
+            previous = self.flows.copy()
+            corrections = self.solve_iteration(n, simultaneous, relaxation)
+            history.append(corrections)
+            if max(map(abs, corrections.values()), default=0) < tol:
+                break
+            if accelerator is not None:
+                self.flows[:] = accelerator.update(previous, self.flows)
+        return history
+
+    def _solve_simultaneous(self, n, relaxation):
+        q = self.flows
+        h_loss = self.resistance_array * q * np.abs(q)**(n-1)
+        deriv = n * self.resistance_array * np.abs(q)**(n-1)
+
+        numerator = self.incidence @ h_loss
+        denominator = abs(self.incidence) @ deriv
+        delta_q = -relaxation * np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator != 0)
+
+        self.flows += self.incidence.T @ delta_q
+        # Same keys as the sequential mode: untraversable loops are skipped
+        return {loop_id: dq for (loop_id, _, _), dq in zip(self.compiled_loops, delta_q.tolist())}
+
+
+def solve_iterations(config, num_iterations, n=2):
+    """
+    Runs `num_iterations` loop-by-loop Hardy Cross iterations on the config's
+    network, as the scene animates them.
+
+    Returns:
+        list: One list per iteration of (loop_id, delta_q, flows) steps, one
+            per loop in the order solve_iteration corrects them, where flows
+            is the {pipe_id: flow} state right after that loop's correction.
+    """
+    solver = HardyCrossSolver(config)
+    history = []
+    for _ in range(num_iterations):
+        steps = []
+        for loop_id, idx, direction in solver.compiled_loops:
+            delta_q = solver.correct_loop(idx, direction, n)
+            steps.append((loop_id, delta_q, dict(solver.current_flows)))
+        history.append(steps)
+    return history
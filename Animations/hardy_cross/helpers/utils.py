@@ -1,8 +1,9 @@
-import yaml
+from hydraulics.cache import load_yaml
 
-def load_config(filepath):
+
+def load_config(filepath, required=()):
     """
-    Load simulation parameters from a YAML file.
+    Load simulation parameters from a YAML file (cached, see hydraulics.cache),
+    checking that the `required` top-level sections are present.
     """
-    with open(filepath, 'r') as f:
-        return yaml.safe_load(f)
+    return load_yaml(filepath, required)
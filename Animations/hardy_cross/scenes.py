@@ -1,12 +1,36 @@
 from manim import *
-from helpers.utils import load_config
+import copy
+import os
+import sys
+
+# Import helpers/ from this folder and the shared hydraulics package and
+# render_profiles from the Animations folder above it
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hydraulics.cache import ConfigCache
+from helpers.physics import solve_iterations
 from helpers.geometry import create_network_mobjects
 from helpers.annotations import create_flow_arrows, create_flow_labels, create_loop_path, create_correction_formula
+from render_profiles import apply_profile
+
+# Load configuration (parsed YAML and the Hardy Cross iterations are cached next to it)
+script_dir = os.path.dirname(os.path.abspath(__file__))
+CACHE = ConfigCache(
+    os.path.join(script_dir, 'inputs.yaml'),
+    sources=(os.path.join(script_dir, 'helpers', 'physics.py'),),
+    required=('network', 'visuals')
+)
+INPUTS = CACHE.config
+NUM_ITERATIONS = 2
+
+# The algorithm text is the subject of this scene, so every profile keeps it
+PROFILE = apply_profile(config)
 
 class HardyCrossScene(MovingCameraScene):
     def construct(self):
-        # Load configuration
-        config = load_config("inputs.yaml")
+        # Working copy: the iterations below write updated flows into it
+        config = copy.deepcopy(INPUTS)
         
         # Initialize Network
         # Now returns tuple: (network_group, nodes_map, pipes_map, tanks_map)
@@ -100,48 +124,43 @@ class HardyCrossScene(MovingCameraScene):
         self.wait(1)
         self.play(Write(delta_q_label))
         
-        # # Iteration Logic
-        # from helpers.physics import HardyCrossSolver
+        # Iteration Logic
+        # Each loop's correction and the flows right after it come from the cached solve
+        history = CACHE.get('loop_steps', solve_iterations, INPUTS, NUM_ITERATIONS)
+        flow_labels, flow_arrows = flow_initial_guess, flow_arrows_guess
 
-        # solver = HardyCrossSolver(config)
-        
-        # num_iterations = 2 
-        
-        # for i in range(num_iterations):
-        #     # Solve one iteration (returns corrections for all loops)
-        #     corrections = solver.solve_iteration()
-            
-        #     for loop_id, delta_q in corrections.items():
-        #         if abs(delta_q) < 0.01: continue
+        for steps in history:
+            for loop_id, delta_q, flows in steps:
+                if abs(delta_q) < 0.01: continue
 
-        #         # Highlight Loop
-        #         loop_path = create_loop_path(config, pipes_map, loop_id)
-        #         self.play(Create(loop_path), run_time=1.0)
+                # Highlight Loop
+                loop_path = create_loop_path(config, pipes_map, loop_id)
+                self.play(Create(loop_path), run_time=1.0)
                 
-        #         # Show Correction Value
-        #         val_text = MathTex(f"{delta_q:.2f}", color=RED).scale(0.8)
-        #         val_text.next_to(delta_q_label, RIGHT)
+                # Show Correction Value
+                val_text = MathTex(f"{delta_q:.2f}", color=RED).scale(0.8)
+                val_text.next_to(delta_q_label, RIGHT)
                 
-        #         self.play(Write(val_text))
-        #         self.wait(0.5)
+                self.play(Write(val_text))
+                self.wait(0.5)
                 
-        #         # Apply updates to config so create_flow_labels picks them up
-        #         for pid in solver.current_flows:
-        #             config['network']['pipes'][pid]['initial_flow'] = solver.current_flows[pid]
+                # Apply updates to config so create_flow_labels picks them up
+                for pid, flow in flows.items():
+                    config['network']['pipes'][pid]['initial_flow'] = flow
                     
-        #         # Create NEW labels
-        #         updated_labels = create_flow_labels(config, pipes_map)
+                # Create NEW labels
+                updated_labels = create_flow_labels(config, pipes_map)
                 
-        #         # Re-create arrows too if direction flipped (flow sign change)
-        #         updated_arrows = create_flow_arrows(config, network_group, pipes_map)
+                # Re-create arrows too if direction flipped (flow sign change)
+                updated_arrows = create_flow_arrows(config, network_group, pipes_map)
                 
-        #         # Animate transition
-        #         self.play(
-        #             Transform(flow_labels, updated_labels),
-        #             Transform(flow_arrows, updated_arrows),
-        #             FadeOut(loop_path),
-        #             FadeOut(val_text), 
-        #             run_time=1.5
-        #         )
+                # Animate transition
+                self.play(
+                    Transform(flow_labels, updated_labels),
+                    Transform(flow_arrows, updated_arrows),
+                    FadeOut(loop_path),
+                    FadeOut(val_text), 
+                    run_time=1.5
+                )
                 
-        # self.wait(2)
+        self.wait(2)
@@ -0,0 +1,22 @@
+"""Shared hydraulics package for the animation scenes.
+
+This package contains scene-independent hydraulic algorithms:
+- loops: Automatic loop (cycle basis) detection for pipe networks
+- acceleration: Anderson mixing for fixed-point (Hardy Cross) iterations
+- friction: Vectorized Darcy friction factors (Swamee-Jain, Colebrook, laminar)
+- pipes: Velocity, Reynolds number, friction factor and head loss kernels
+- series_parallel: Balanced flow splits and node heads for series-parallel layouts
+- profiles: EGL/HGL grade lines and velocity profiles
+- cache: Content-hash keyed binary cache for inputs.yaml and derived results
+- transients: Method-of-characteristics water hammer for series pipelines
+"""
+from .loops import fundamental_loops
+from .acceleration import AndersonAccelerator
+from .friction import colebrook, friction_factor, swamee_jain
+from .pipes import calculate_friction_factor, calculate_head_loss, calculate_reynolds, calculate_velocity
+from .series_parallel import calculate_parallel_flows, calculate_system_heads, solve_series_parallel
+from .profiles import (
+    calculate_egl_hgl, calculate_uniform_egl_hgl, get_closed_pipe_velocity,
+    get_open_channel_velocity, longitudinal_profile, tabulate_profile
+)
+from .transients import simulate_valve_closure
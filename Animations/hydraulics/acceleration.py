@@ -0,0 +1,52 @@
+"""Convergence acceleration for fixed-point solvers."""
+import numpy as np
+
+
+class AndersonAccelerator:
+    """Anderson mixing for fixed-point iterations x <- g(x).
+
+    Keeps the last `memory` iterates and residuals f = g(x) - x and
+    replaces the plain update with the affine combination of previous
+    g(x) values that minimizes the residual in the least-squares sense.
+    Affine combinations preserve linear constraints that every g(x)
+    satisfies, so Hardy Cross flows stay mass-balanced.
+
+    Args:
+        memory (int): Number of previous steps to mix (m).
+        beta (float): Mixing (damping) parameter; 1 is undamped.
+
+    Example:
+        accel = AndersonAccelerator(memory=5)
+        while not converged:
+            x = accel.update(x, g(x))
+    """
+    def __init__(self, memory=5, beta=1.0):
+        self.memory = memory
+        self.beta = beta
+        self.reset()
+
+    def reset(self):
+        self._x = None
+        self._f = None
+        self._dx = []
+        self._df = []
+
+    def update(self, x, gx):
+        """Returns the next iterate given the current x and g(x)."""
+        x = np.asarray(x, dtype=float)
+        f = np.asarray(gx, dtype=float) - x
+        if self._x is not None:
+            self._dx.append(x - self._x)
+            self._df.append(f - self._f)
+            if len(self._df) > self.memory:
+                self._dx.pop(0)
+                self._df.pop(0)
+        self._x, self._f = x.copy(), f.copy()
+
+        if not self._df:
+            return x + self.beta * f
+
+        dF = np.column_stack(self._df)
+        dX = np.column_stack(self._dx)
+        gamma = np.linalg.lstsq(dF, f, rcond=1e-10)[0]
+        return x + self.beta * f - (dX + self.beta * dF) @ gamma
@@ -0,0 +1,202 @@
+"""Binary cache for parsed inputs.yaml files and the physics computed from them.
+
+The cache is an .npz archive written next to the YAML (`inputs.yaml.cache`)
+and keyed by a SHA-256 of the YAML bytes plus the hydraulics source files, so
+editing either one invalidates it. Re-renders with unchanged inputs skip
+both YAML parsing and the solves routed through ConfigCache.get.
+
+The archive holds data only: a JSON header with the config and results, plus
+one entry per numpy array. It is read with allow_pickle=False, so a tampered
+cache file can at worst be rejected and rebuilt, never run code.
+"""
+import glob
+import hashlib
+import json
+import os
+
+import numpy as np
+import yaml
+
+# Results kept per cache file; the least recently used are evicted first
+MAX_RESULTS = 64
+
+PACKAGE_SOURCES = tuple(sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), '*.py'))))
+
+_source_digests = {}
+
+
+def _source_digest(paths):
+    """SHA-256 over the given source files, computed once per process."""
+    if paths not in _source_digests:
+        h = hashlib.sha256()
+        for path in paths:
+            with open(path, 'rb') as f:
+                h.update(f.read())
+        _source_digests[paths] = h.digest()
+    return _source_digests[paths]
+
+
+def _encode(obj, arrays):
+    """
+    Converts obj to JSON-compatible data, moving numpy arrays into `arrays`.
+    Tuples and dicts with non-string keys are tagged so they decode back to
+    the same types.
+    """
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.hasobject:
+            raise TypeError("Object arrays cannot be cached")
+        arrays.append(obj)
+        return {'__array__': len(arrays) - 1}
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    if isinstance(obj, tuple):
+        return {'__tuple__': [_encode(v, arrays) for v in obj]}
+    if isinstance(obj, list):
+        return [_encode(v, arrays) for v in obj]
+    if isinstance(obj, dict):
+        if all(isinstance(k, str) and not k.startswith('__') for k in obj):
+            return {k: _encode(v, arrays) for k, v in obj.items()}
+        return {'__items__': [[_encode(k, arrays), _encode(v, arrays)] for k, v in obj.items()]}
+    raise TypeError(f"{type(obj).__name__} values cannot be cached")
+
+
+def _decode(data, arrays):
+    """Inverse of _encode."""
+    if isinstance(data, list):
+        return [_decode(v, arrays) for v in data]
+    if not isinstance(data, dict):
+        return data
+    if '__array__' in data:
+        return arrays[data['__array__']]
+    if '__tuple__' in data:
+        return tuple(_decode(v, arrays) for v in data['__tuple__'])
+    if '__items__' in data:
+        return {_decode(k, arrays): _decode(v, arrays) for k, v in data['__items__']}
+    return {k: _decode(v, arrays) for k, v in data.items()}
+
+
+def _digest(obj):
+    """SHA-256 identifying plain data (as accepted by _encode), arrays included."""
+    arrays = []
+    h = hashlib.sha256(json.dumps(_encode(obj, arrays), sort_keys=True).encode())
+    for a in arrays:
+        h.update(f"{a.dtype.str}{a.shape}".encode())
+        h.update(np.ascontiguousarray(a).tobytes())
+    return h.hexdigest()
+
+
+def validate_config(config, required=(), path='config'):
+    """
+    Checks that a parsed config is a mapping holding the `required` top-level
+    sections.
+
+    Raises:
+        ValueError: If the document is not a mapping or a section is missing.
+    """
+    if not isinstance(config, dict):
+        raise ValueError(f"{path} must contain a mapping at the top level, got {type(config).__name__}")
+    missing = [key for key in required if key not in config]
+    if missing:
+        raise ValueError(f"{path} is missing required section(s): {', '.join(missing)}")
+    return config
+
+
+class ConfigCache:
+    """
+    Parsed and validated YAML config plus memoized results derived from it.
+
+    Args:
+        yaml_path (str): Path to the YAML file.
+        sources (tuple): Extra source files whose edits should invalidate the
+            cached results (the hydraulics package is always included).
+        required (tuple): Top-level sections the config must define
+            (see validate_config).
+    """
+    def __init__(self, yaml_path, sources=(), required=()):
+        self.yaml_path = os.path.abspath(yaml_path)
+        if not os.path.exists(self.yaml_path):
+            raise FileNotFoundError(f"Configuration file not found: {self.yaml_path}")
+        self.cache_path = self.yaml_path + '.cache'
+
+        with open(self.yaml_path, 'rb') as f:
+            text = f.read()
+        self.key = hashlib.sha256(text + _source_digest(PACKAGE_SOURCES + tuple(sources))).hexdigest()
+
+        payload = self._read()
+        if payload is not None:
+            self.config = payload['config']
+            self._results = {(name, digest): result for name, digest, result in payload['results']}
+        else:
+            try:
+                self.config = yaml.safe_load(text)
+            except yaml.YAMLError as e:
+                raise yaml.YAMLError(f"Error parsing YAML file {self.yaml_path}: {e}")
+            self._results = {}
+        # Checked on every load: callers may require different sections
+        validate_config(self.config, required, self.yaml_path)
+        if payload is None:
+            self._write()
+
+    def _read(self):
+        # A missing, stale or unreadable cache is simply rebuilt
+        try:
+            with np.load(self.cache_path, allow_pickle=False) as archive:
+                header = json.loads(archive['header'].tobytes())
+                if header.get('key') != self.key:
+                    return None
+                arrays = [archive[f'a{i}'] for i in range(header['arrays'])]
+            return _decode(header['payload'], arrays)
+        except Exception:
+            return None
+
+    def _write(self):
+        arrays = []
+        results = [[name, digest, result] for (name, digest), result in self._results.items()]
+        try:
+            payload = _encode({'config': self.config, 'results': results}, arrays)
+            header = json.dumps({'key': self.key, 'arrays': len(arrays), 'payload': payload}).encode()
+        except (TypeError, ValueError):
+            # YAML values with no cache encoding (e.g. dates): run uncached
+            return
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.savez_compressed(f, header=np.frombuffer(header, dtype=np.uint8),
+                                    **{f'a{i}': a for i, a in enumerate(arrays)})
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            # Read-only checkouts still work, just without the cache
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def get(self, name, compute, *args, **kwargs):
+        """
+        Returns compute(*args, **kwargs), cached under `name` and the
+        arguments. Only plain data is cached: YAML-style values, tuples and
+        numeric numpy arrays. Anything else is computed on every call.
+        At most MAX_RESULTS results are kept, least recently used first out.
+        """
+        try:
+            key = (name, _digest((list(args), kwargs)))
+        except (TypeError, ValueError):
+            return compute(*args, **kwargs)
+        if key in self._results:
+            self._results[key] = self._results.pop(key)
+            return self._results[key]
+        result = compute(*args, **kwargs)
+        try:
+            _encode(result, [])
+        except (TypeError, ValueError):
+            return result
+        self._results[key] = result
+        while len(self._results) > MAX_RESULTS:
+            del self._results[next(iter(self._results))]
+        self._write()
+        return result
+
+
+def load_yaml(yaml_path, required=()):
+    """Parsed and validated YAML from the cache, re-parsing only when the file changed."""
+    return ConfigCache(yaml_path, required=required).config
@@ -0,0 +1,148 @@
+"""Darcy friction factors for whole pipe arrays at once."""
+import numpy as np
+
+LAMINAR_LIMIT = 2000.0
+TURBULENT_LIMIT = 4000.0
+
+
+def reynolds(velocity, diameter, nu=1.0e-6):
+    """Reynolds number |v| D / nu for scalars or arrays."""
+    return np.abs(velocity) * np.asarray(diameter, dtype=float) / nu
+
+
+def swamee_jain(re, roughness, diameter):
+    """Explicit Swamee-Jain approximation of Colebrook-White (turbulent flow only).
+
+    Args:
+        re (array): Reynolds numbers (> 0).
+        roughness (array): Absolute roughness (m).
+        diameter (array): Pipe diameter (m).
+    """
+    re = np.asarray(re, dtype=float)
+    return 0.25 / np.log10(np.asarray(roughness) / (3.7 * np.asarray(diameter)) + 5.74 / re**0.9)**2
+
+
+def colebrook(re, roughness, diameter, f0=None, tol=1e-10, max_iter=20):
+    """Colebrook-White friction factor by Newton iteration on x = 1/sqrt(f).
+
+    Solves x = -2 log10(e / 3.7D + 2.51 x / Re) for every pipe together;
+    pipes drop out once their update is below `tol`.
+
+    Args:
+        re (array): Reynolds numbers (> 0).
+        roughness (array): Absolute roughness (m).
+        diameter (array): Pipe diameter (m).
+        f0 (array): Starting friction factors, e.g. the previous solver
+            iteration's values. Swamee-Jain is used where missing (<= 0).
+        tol (float): Convergence threshold on x.
+        max_iter (int): Maximum Newton iterations.
+
+    Returns:
+        array: Darcy friction factors.
+    """
+    re, roughness, diameter = np.broadcast_arrays(
+        np.asarray(re, dtype=float), np.asarray(roughness, dtype=float), np.asarray(diameter, dtype=float)
+    )
+    a = roughness / (3.7 * diameter)
+    b = 2.51 / re
+    if f0 is None:
+        f = swamee_jain(re, roughness, diameter)
+    else:
+        f = np.array(np.broadcast_to(f0, re.shape), dtype=float)
+        missing = f <= 0
+        if missing.any():
+            f[missing] = swamee_jain(re[missing], roughness[missing], diameter[missing])
+    x = 1.0 / np.sqrt(f)
+
+    active = np.flatnonzero(np.ones(x.shape, dtype=bool))
+    x = x.ravel().copy()
+    a, b = a.ravel(), b.ravel()
+    for _ in range(max_iter):
+        inner = a[active] + b[active] * x[active]
+        residual = x[active] + 2 * np.log10(inner)
+        step = residual / (1 + 2 * b[active] / (inner * np.log(10)))
+        x[active] -= step
+        active = active[np.abs(step) >= tol]
+        if not active.size:
+            break
+    return (1.0 / x**2).reshape(re.shape)
+
+
+def friction_factor(re, roughness, diameter, method='swamee-jain', f0=None, transitional=False):
+    """Darcy friction factor with laminar handling.
+
+    Uses 64/Re below Re = 2000, zero for Re = 0, and `method`
+    ('swamee-jain' or 'colebrook') for turbulent flow. Accepts scalars or
+    arrays; a signed Re (reverse flow) uses |Re|. f0 warm-starts Colebrook.
+
+    With transitional=True, f is interpolated linearly in Re between the
+    laminar value at 2000 and the turbulent value at 4000 instead of
+    jumping at 2000. Iterative network solvers need this continuity to
+    converge when a pipe sits near the transition.
+    """
+    re, roughness, diameter = np.broadcast_arrays(
+        np.abs(np.asarray(re, dtype=float)), np.asarray(roughness, dtype=float), np.asarray(diameter, dtype=float)
+    )
+    f = np.zeros(re.shape)
+    laminar = (re > 0) & (re < LAMINAR_LIMIT)
+    f[laminar] = 64 / re[laminar]
+
+    turbulent = re >= LAMINAR_LIMIT
+    # Transitional pipes are evaluated at the Re = 4000 end of the blend
+    re_turbulent = np.maximum(re, TURBULENT_LIMIT) if transitional else re
+    if turbulent.any():
+        args = (re_turbulent[turbulent], roughness[turbulent], diameter[turbulent])
+        if method == 'colebrook':
+            start = None if f0 is None else np.broadcast_to(f0, re.shape)[turbulent]
+            f[turbulent] = colebrook(*args, f0=start)
+        elif method == 'swamee-jain':
+            f[turbulent] = swamee_jain(*args)
+        else:
+            raise ValueError(f"Unknown friction method: {method}")
+    if transitional:
+        blend = turbulent & (re < TURBULENT_LIMIT)
+        w = (re[blend] - LAMINAR_LIMIT) / (TURBULENT_LIMIT - LAMINAR_LIMIT)
+        f[blend] = (1 - w) * 64 / LAMINAR_LIMIT + w * f[blend]
+    return f if f.ndim else float(f)
+
+
+def friction_factor_slope(re, roughness, diameter, f, transitional=False):
+    """Logarithmic slope d ln f / d ln Re of friction_factor(method='colebrook').
+
+    Network solvers need it for the exact Darcy-Weisbach Jacobian: with
+    hf = k(Q) Q|Q| and k proportional to f, dhf/dQ = k |Q| (2 + slope).
+
+    Args:
+        re (array): Reynolds numbers (> 0).
+        roughness (array): Absolute roughness (m).
+        diameter (array): Pipe diameter (m).
+        f (array): Friction factors at `re`, as returned by friction_factor.
+        transitional (bool): Must match the friction_factor call.
+
+    Returns:
+        array: -1 for laminar flow, the (negative) Colebrook slope for
+            turbulent flow and the slope of the blend in between.
+    """
+    re, roughness, diameter, f = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (re, roughness, diameter, f)))
+    re = np.abs(re)
+    slope = np.full(re.shape, -1.0)
+
+    # Implicit differentiation of x = -2 log10(a + b x), x = 1/sqrt(f), b = 2.51/Re
+    turbulent = re >= (TURBULENT_LIMIT if transitional else LAMINAR_LIMIT)
+    x = 1.0 / np.sqrt(f[turbulent])
+    b = 2.51 / re[turbulent]
+    c = 2 * b / ((roughness[turbulent] / (3.7 * diameter[turbulent]) + b * x) * np.log(10))
+    slope[turbulent] = -2 * c / (1 + c)
+
+    if transitional:
+        # f = (1 - w) 64/2000 + w f(4000) is linear in Re
+        blend = (re >= LAMINAR_LIMIT) & (re < TURBULENT_LIMIT)
+        f_turbulent = colebrook(np.full(blend.sum(), TURBULENT_LIMIT), roughness[blend], diameter[blend])
+        slope[blend] = re[blend] / f[blend] * (f_turbulent - 64 / LAMINAR_LIMIT) / (TURBULENT_LIMIT - LAMINAR_LIMIT)
+    return slope
+
+
+def darcy_weisbach_resistance(lengths, diameters, friction_factors, g=9.81):
+    """Resistance k = 8 f L / (g pi^2 D^5), so that hf = k * Q|Q|."""
+    d = np.asarray(diameters, dtype=float)
+    return 8 * np.asarray(friction_factors) * np.asarray(lengths) / (g * np.pi**2 * d**5)
@@ -0,0 +1,78 @@
+"""Single-pipe kernels: velocity, Reynolds number, friction factor, head loss.
+
+Every function accepts scalars or arrays (broadcast together) and returns
+a float for scalar input, so scenes can pass one pipe or all of them.
+"""
+import numpy as np
+
+from .friction import friction_factor
+
+
+def _result(value):
+    return float(value) if np.ndim(value) == 0 else value
+
+
+def calculate_velocity(flow_rate, diameter):
+    """
+    Calculates fluid velocity.
+    Args:
+        flow_rate (float or array): Volumetric flow rate (e.g., m^3/s).
+        diameter (float or array): Pipe diameter (e.g., m).
+    Returns:
+        float or array: Velocity (e.g., m/s); zero where diameter <= 0.
+    """
+    q, d = np.broadcast_arrays(np.asarray(flow_rate, dtype=float), np.asarray(diameter, dtype=float))
+    area = np.pi * (d / 2)**2
+    return _result(np.divide(q, area, out=np.zeros(q.shape), where=d > 0))
+
+
+def calculate_reynolds(v, d, nu):
+    """
+    Calculates Reynolds number.
+    Args:
+        v (float or array): Velocity (m/s)
+        d (float or array): Diameter (m)
+        nu (float or array): Kinematic viscosity (m^2/s); inf where nu <= 0.
+    """
+    v, d, nu = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (v, d, nu)))
+    return _result(np.divide(v * d, nu, out=np.full(v.shape, np.inf), where=nu > 0))
+
+
+def calculate_friction_factor(re, roughness, d):
+    """
+    Calculates friction factor using Swamee-Jain equation (turbulent)
+    or 64/Re (laminar).
+
+    Args:
+        re (float or array): Reynolds number
+        roughness (float or array): Absolute roughness (m)
+        d (float or array): Pipe diameter (m)
+    """
+    return _result(friction_factor(re, roughness, d))
+
+
+def calculate_head_loss(length, diameter, v, g=9.81, roughness=0.0015e-3, nu=1.0e-6):
+    """
+    Calculates head loss using Darcy-Weisbach equation.
+
+    Args:
+        length (float or array): Pipe length (m)
+        diameter (float or array): Pipe diameter (m)
+        v (float or array): Velocity (m/s)
+        g (float): Gravity (m/s^2)
+        roughness (float or array): Roughness height (m)
+        nu (float): Kinematic viscosity (m^2/s)
+
+    Returns:
+        float or array: Head loss (m); zero where length or diameter <= 0.
+    """
+    length, diameter, v, roughness = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (length, diameter, v, roughness))
+    )
+    valid = (diameter > 0) & (length > 0)
+    d = np.where(valid, diameter, 1.0)
+    f = friction_factor(calculate_reynolds(np.abs(v), d, nu), roughness, d)
+
+    # h_f = f * (L/D) * (v^2/2g)
+    head_loss = f * (length / d) * (v**2 / (2 * g))
+    return _result(np.where(valid, head_loss, 0.0))
@@ -0,0 +1,209 @@
+"""Profiles along and across pipes: EGL/HGL grade lines and velocity distributions."""
+import numpy as np
+
+from .friction import friction_factor as darcy_friction_factor
+
+
+def _result(value):
+    return float(value) if np.ndim(value) == 0 else value
+
+
+def get_open_channel_velocity(y, y_bed, y_surface, v_max):
+    """Calculates velocity for open channel flow (1/7 power law).
+
+    Args:
+        y: Y-coordinate (or array) to evaluate.
+        y_bed: Bottom boundary.
+        y_surface: Top (free surface) boundary.
+        v_max: Maximum velocity.
+
+    Returns:
+        Velocity value(s) at the given y-coordinate(s).
+    """
+    y = np.asarray(y, dtype=float)
+    depth = y_surface - y_bed
+    if depth == 0:
+        return _result(np.zeros_like(y))
+    rel_y = (np.clip(y, y_bed, y_surface) - y_bed) / depth
+    return _result(v_max * np.power(rel_y, 1/7))
+
+
+def get_closed_pipe_velocity(y, y_bottom, y_top, v_max):
+    """Calculates parabolic velocity profile for closed pipe flow.
+
+    Args:
+        y: Y-coordinate (or array) to evaluate.
+        y_bottom: Pipe bottom.
+        y_top: Pipe top.
+        v_max: Maximum velocity (at center).
+
+    Returns:
+        Velocity value(s) at the given y-coordinate(s); zero at and beyond the wall.
+    """
+    R = (y_top - y_bottom) / 2
+    y_center = (y_top + y_bottom) / 2
+    r = np.abs(np.asarray(y, dtype=float) - y_center)
+    if R <= 0:
+        return _result(np.zeros_like(r))
+    return _result(np.where(r >= R, 0.0, v_max * (1 - (r/R)**2)))
+
+
+def tabulate_profile(velocity_func, y_range, samples=256):
+    """Lookup-table version of a velocity profile.
+
+    Samples velocity_func once over y_range (as one array call) and returns
+    a function that linearly interpolates the table, for render-time use
+    with many points or expensive profiles.
+
+    Args:
+        velocity_func: Array-capable profile, e.g. lambda y: get_closed_pipe_velocity(y, 0, 1, 2).
+        y_range: Tuple (y_min, y_max) to tabulate.
+        samples: Number of table points.
+
+    Returns:
+        function: y (float or array) -> interpolated velocity.
+    """
+    y_table = np.linspace(y_range[0], y_range[1], samples)
+    v_table = np.asarray(velocity_func(y_table), dtype=float)
+
+    def lookup(y):
+        return _result(np.interp(y, y_table, v_table))
+
+    return lookup
+
+
+def _segment_lengths(points):
+    """Points as an (N, dim) float array and the N-1 straight segment lengths."""
+    path_points = np.asarray(points, dtype=float).reshape(len(points), -1)
+    return path_points, np.sqrt((np.diff(path_points, axis=0)**2).sum(axis=1))
+
+
+def _grade_lines(x, egl, velocity_head):
+    """Stacks x, EGL and HGL = EGL - v^2/2g into two (N, 3) point arrays."""
+    egl_points = np.zeros((len(x), 3))
+    hgl_points = np.zeros((len(x), 3))
+    egl_points[:, 0] = hgl_points[:, 0] = x
+    egl_points[:, 1] = egl
+    hgl_points[:, 1] = egl - velocity_head
+    return egl_points, hgl_points
+
+
+def longitudinal_profile(points, diameters, flow_rates, initial_head, gravity=9.81, roughness=0.0015e-3,
+                         nu=1.0e-6, minor_loss_coefficients=None, friction_factor=None, method='swamee-jain'):
+    """EGL/HGL heads along a multi-segment pipeline for one or many flow rates.
+
+    Each segment gets its own velocity, Reynolds number and Darcy friction
+    factor (64/Re when laminar, `method` when turbulent), so diameter and
+    roughness changes along the line are handled without splitting it by
+    hand. flow_rates may be an array of any shape; it becomes the leading
+    batch dimension and every flow rate is evaluated in the same call.
+
+    Each segment contributes two points: its start (after the entrance minor
+    loss) and its end (after friction). Segments with diameter <= 1 mm are
+    treated as closed and carry no velocity head.
+
+    Args:
+        points (array-like): (N, 2) or (N, 3) points defining the path segments.
+        diameters (array-like): Diameter of each of the N-1 segments.
+        flow_rates (float or array): Volume flow rate(s) Q.
+        initial_head (float): Total energy head at the first point.
+        gravity (float): Gravitational acceleration (g).
+        roughness (float or array): Absolute roughness, per segment or shared.
+        nu (float): Kinematic viscosity.
+        minor_loss_coefficients (array-like, optional): Entrance loss K per segment.
+        friction_factor (float or array, optional): Fixed Darcy f overriding
+            the Reynolds-based value.
+        method (str): 'swamee-jain' or 'colebrook' for turbulent segments.
+
+    Returns:
+        tuple: (x, egl, hgl) where x has shape (2 * (N-1),) and egl/hgl have
+            shape flow_rates.shape + (2 * (N-1),).
+    """
+    path_points, segment_length = _segment_lengths(points)
+    n_segments = len(segment_length)
+    diameter = np.asarray(diameters, dtype=float)[:n_segments]
+    if minor_loss_coefficients is None:
+        ks = np.zeros(n_segments)
+    else:
+        ks = np.asarray(minor_loss_coefficients, dtype=float)[:n_segments]
+
+    # Velocity and velocity head per flow rate and segment
+    open_pipe = diameter > 0.001
+    d = np.where(open_pipe, diameter, 1.0)
+    q = np.asarray(flow_rates, dtype=float)[..., None]
+    velocity = np.where(open_pipe, q / (np.pi * d**2 / 4), 0.0)
+    velocity_head = velocity**2 / (2 * gravity)
+
+    if friction_factor is None:
+        f = darcy_friction_factor(np.abs(velocity) * d / nu, roughness, d, method=method)
+    else:
+        f = friction_factor
+
+    # Minor loss at each entrance, then friction along the segment; the
+    # running sum of the interleaved losses gives the EGL at every point
+    losses = np.empty(velocity.shape + (2,))
+    losses[..., 0] = ks * velocity_head
+    losses[..., 1] = np.where(open_pipe, f * (segment_length / d) * velocity_head, 0.0)
+    losses = losses.reshape(velocity.shape[:-1] + (2 * n_segments,))
+    egl = initial_head - np.cumsum(losses, axis=-1)
+    hgl = egl - np.repeat(velocity_head, 2, axis=-1)
+
+    x = np.column_stack([path_points[:-1, 0], path_points[1:, 0]]).ravel()
+    return x, egl, hgl
+
+
+def calculate_egl_hgl(points, diameters, initial_head, gravity, friction_factor, flow_rate, minor_loss_coefficients=None,
+                      roughness=0.0015e-3, nu=1.0e-6):
+    """Calculates Energy Grade Line (EGL) and Hydraulic Grade Line (HGL) points.
+
+    Computes the hydraulic profile along a path with variable cross-sections, 
+    accounting for both major friction losses (slope) and minor losses (steps).
+    See longitudinal_profile for the calculation and for batches of flow rates.
+
+    Args:
+        points (array-like): (N, 2) or (N, 3) points defining the path segments.
+        diameters (array-like): Diameters for each segment. Length must be len(points)-1.
+        initial_head (float): The starting total energy head (elevation + pressure + velocity).
+        gravity (float): Gravitational acceleration (g).
+        friction_factor (float): Darcy-Weisbach friction factor 'f' (dimensionless).
+            None computes it per segment from the Reynolds number.
+        flow_rate (float): Volume flow rate (Q).
+        minor_loss_coefficients (array-like, optional): Minor loss coefficients (K) 
+            for each segment. Defaults to None (all zeros).
+        roughness (float or array): Absolute roughness, used when friction_factor is None.
+        nu (float): Kinematic viscosity, used when friction_factor is None.
+
+    Returns:
+        tuple: Two (2 * (N-1), 3) arrays of [x, head, 0] rows:
+            - egl_points: Energy Grade Line.
+            - hgl_points: Hydraulic Grade Line.
+    """
+    x, egl, hgl = longitudinal_profile(
+        points, diameters, flow_rate, initial_head, gravity, roughness, nu,
+        minor_loss_coefficients=minor_loss_coefficients, friction_factor=friction_factor
+    )
+    return _grade_lines(x, egl, egl - hgl)
+
+
+def calculate_uniform_egl_hgl(points, initial_head, gravity, friction_factor, flow_velocity):
+    """Calculates EGL and HGL points along a path.
+
+    Simplified 1D hydraulics with constant velocity and friction losses.
+
+    Args:
+        points: (N, 2) or (N, 3) path points.
+        initial_head: Starting total energy head.
+        gravity: Gravitational acceleration.
+        friction_factor: Head loss per unit length.
+        flow_velocity: Flow velocity.
+
+    Returns:
+        tuple: (egl_points, hgl_points) as (N, 3) arrays of [x, head, 0] rows.
+    """
+    path_points, segment_length = _segment_lengths(points)
+    velocity_head = (flow_velocity**2) / (2 * gravity)
+
+    egl = np.empty(len(path_points))
+    egl[:1] = initial_head
+    egl[1:] = initial_head - friction_factor * np.cumsum(segment_length)
+    return _grade_lines(path_points[:, 0], egl, velocity_head)
@@ -0,0 +1,230 @@
+"""Series-parallel pipe layouts: balanced flow splits and node heads."""
+from collections import defaultdict, deque
+
+import numpy as np
+
+from .friction import friction_factor
+from .pipes import calculate_head_loss, calculate_velocity
+
+
+def calculate_parallel_flows(total_Q, pipes_data, roughness=0.0015e-3, nu=1.0e-6, g=9.81, tol=1e-9):
+    """
+    Calculates flow rate for parallel pipes by balancing their Darcy-Weisbach
+    head losses (see solve_series_parallel).
+    
+    Args:
+        total_Q (float): Total inflow.
+        pipes_data (list): List of dicts with 'diameter_mm', 'length', 'id'.
+        roughness (float): Roughness height (m).
+        nu (float): Kinematic viscosity (m^2/s).
+        g (float): Gravity (m/s^2).
+        tol (float): Allowed head loss mismatch between branches (m).
+        
+    Returns:
+        dict: Mapping of pipe_id -> flow_rate
+    """
+    pipes_config = {
+        p['id']: {**p, 'start_node': 'split', 'end_node': 'merge'} for p in pipes_data
+    }
+    phys_config = {
+        'default_roughness': roughness * 1000.0, 'kinematic_viscosity': nu, 'gravity': g,
+    }
+    return solve_series_parallel(pipes_config, total_Q, phys_config, 'split', 'merge', tol=tol)
+
+
+def _pipe_arrays(pipes_config, phys_config):
+    """Length, diameter (m) and roughness (m) arrays in pipes_config order."""
+    default_roughness = float(phys_config.get('default_roughness', 0.0015))
+    pipes = list(pipes_config.values())
+    lengths = np.array([p['length'] for p in pipes], dtype=float)
+    diameters = np.array([p['diameter_mm'] for p in pipes], dtype=float) / 1000.0
+    roughness = np.array([p.get('roughness_mm', default_roughness) for p in pipes], dtype=float) / 1000.0
+    return lengths, diameters, roughness
+
+
+def _reduce_series_parallel(pipes_config, source, sink):
+    """
+    Reduces a two-terminal pipe graph to nested series/parallel blocks.
+
+    Elements 0..P-1 are the pipes; each reduction appends a block
+    (kind, children) with kind 'series' (children ordered along the path)
+    or 'parallel'. Returns (blocks, root, ends) where ends[e] are the two
+    end nodes of element e.
+    """
+    ends = [(p['start_node'], p['end_node']) for p in pipes_config.values()]
+    blocks = []
+    live = set(range(len(ends)))
+
+    def merge(kind, children, a, b):
+        blocks.append((kind, children))
+        ends.append((a, b))
+        live.difference_update(children)
+        live.add(len(ends) - 1)
+
+    while len(live) > 1:
+        by_ends = defaultdict(list)
+        for e in live:
+            by_ends[frozenset(ends[e])].append(e)
+        parallel = [group for group in by_ends.values() if len(group) > 1]
+        for group in parallel:
+            merge('parallel', group, *ends[group[0]])
+        if parallel:
+            continue
+
+        incident = defaultdict(list)
+        for e in live:
+            for node in ends[e]:
+                incident[node].append(e)
+        node = next((n for n, es in incident.items() if len(es) == 2 and n not in (source, sink)), None)
+        if node is None:
+            raise ValueError("Pipe network is not a series-parallel network between source and sink")
+        first, second = incident[node]
+        a = ends[first][0] if ends[first][1] == node else ends[first][1]
+        b = ends[second][0] if ends[second][1] == node else ends[second][1]
+        merge('series', [first, second], a, b)
+
+    root = live.pop()
+    if set(ends[root]) != {source, sink}:
+        raise ValueError("Pipe network is not a series-parallel network between source and sink")
+    return blocks, root, ends
+
+
+def solve_series_parallel(pipes_config, total_Q, phys_config, source=None, sink=None, tol=1e-9, max_iter=100):
+    """
+    Solves flows in an arbitrary series-parallel pipe network carrying
+    total_Q from source to sink.
+
+    The network is reduced once to nested series/parallel blocks. With
+    friction factors held fixed, every pipe obeys h = r Q^2, so blocks
+    combine exactly (series: r = sum r_i, parallel: r^-1/2 = sum r_i^-1/2)
+    and the split of each block's flow follows directly. Friction factors
+    are then refreshed for all pipes in one array operation and the split
+    repeated until the head losses of every parallel block's branches agree
+    to within `tol`.
+
+    Args:
+        pipes_config (dict): Pipes data with 'start_node', 'end_node',
+            'length', 'diameter_mm' and optionally 'roughness_mm'.
+        total_Q (float): Flow from source to sink (m^3/s).
+        phys_config (dict): Physics settings (viscosity, roughness, gravity).
+        source, sink: End node ids; default to the two nodes with one pipe.
+        tol (float): Allowed head loss mismatch between parallel branches (m).
+        max_iter (int): Maximum friction-factor updates.
+
+    Returns:
+        dict: {pipe id: flow}, positive from start_node to end_node.
+    """
+    nu = float(phys_config.get('kinematic_viscosity', 1.0e-6))
+    g = float(phys_config.get('gravity', 9.81))
+    lengths, diameters, roughness = _pipe_arrays(pipes_config, phys_config)
+
+    if source is None or sink is None:
+        degree = defaultdict(int)
+        for p in pipes_config.values():
+            degree[p['start_node']] += 1
+            degree[p['end_node']] += 1
+        terminals = [n for n, d in degree.items() if d == 1]
+        if len(terminals) != 2:
+            raise ValueError("Pass source and sink explicitly; they cannot be inferred")
+        starts = {p['start_node'] for p in pipes_config.values()}
+        source, sink = terminals if terminals[0] in starts else terminals[::-1]
+    blocks, root, ends = _reduce_series_parallel(pipes_config, source, sink)
+
+    n_pipes = len(lengths)
+    area = np.pi * (diameters / 2)**2
+    r_all = np.zeros(n_pipes + len(blocks))
+    q_all = np.zeros(n_pipes + len(blocks))
+    f = np.full(n_pipes, 0.02)
+    parallel = [(n_pipes + i, np.array(children)) for i, (kind, children) in enumerate(blocks) if kind == 'parallel']
+
+    for _ in range(max_iter):
+        # Bottom-up equivalent resistances, top-down flow split
+        r_all[:n_pipes] = f * lengths / (2 * g * diameters * area**2)
+        for i, (kind, children) in enumerate(blocks):
+            r = r_all[children]
+            r_all[n_pipes + i] = r.sum() if kind == 'series' else (r**-0.5).sum()**-2
+        q_all[root] = abs(total_Q)
+        for i in range(len(blocks) - 1, -1, -1):
+            kind, children = blocks[i]
+            q = q_all[n_pipes + i]
+            q_all[children] = q if kind == 'series' else q * np.sqrt(r_all[n_pipes + i] / r_all[children])
+
+        velocity = q_all[:n_pipes] / area
+        f = friction_factor(velocity * diameters / nu, roughness, diameters)
+        if total_Q == 0:
+            break
+        r_all[:n_pipes] = f * lengths / (2 * g * diameters * area**2)
+        h_all = r_all * q_all**2
+        for i, (kind, children) in enumerate(blocks):
+            h_all[n_pipes + i] = h_all[children].sum() if kind == 'series' else h_all[children].mean()
+        if all(np.ptp(h_all[children]) <= tol for _, children in parallel):
+            break
+
+    # Orient each pipe's flow from source to sink
+    signs = np.ones(n_pipes)
+    stack = [(root, source)]
+    while stack:
+        e, upstream = stack.pop()
+        if e < n_pipes:
+            signs[e] = 1.0 if ends[e][0] == upstream else -1.0
+            continue
+        kind, children = blocks[e - n_pipes]
+        if kind == 'parallel':
+            stack.extend((c, upstream) for c in children)
+            continue
+        for c in sorted(children, key=lambda c: upstream not in ends[c]):
+            stack.append((c, upstream))
+            upstream = ends[c][1] if ends[c][0] == upstream else ends[c][0]
+
+    flows = np.sign(total_Q) * signs * q_all[:n_pipes]
+    return {p['id']: float(q) for p, q in zip(pipes_config.values(), flows)}
+
+def calculate_system_heads(nodes_config, pipes_config, flows, phys_config):
+    """
+    Calculates Hydraulic Head (H) at each node in the network.
+    Heads are propagated from the source node (type "source", else the
+    first node) breadth-first along the pipes' start_node/end_node
+    connections, so any topology works. Also calculates velocity for each pipe.
+    
+    Args:
+        nodes_config (dict): Nodes data
+        pipes_config (dict): Pipes data
+        flows (dict): Flow rates by pipe ID/key suffix (e.g. 'A', 'inlet');
+            pipes without an entry carry flows['series_flow'] (0 if absent)
+        phys_config (dict): Physics settings (viscosity, roughness, gravity)
+        
+    Returns:
+        tuple: (node_heads, pipe_velocities)
+            - node_heads: dict {node_id: head_value}
+            - pipe_velocities: dict {pipe_key: velocity}
+    """
+    nu = float(phys_config.get('kinematic_viscosity', 1.0e-6))
+    g = float(phys_config.get('gravity', 9.81))
+    lengths, diameters, roughness = _pipe_arrays(pipes_config, phys_config)
+
+    # 1. Velocities and head losses for all pipes at once
+    # Series layouts may give only the system flow
+    series_flow = flows.get('series_flow', 0.0)
+    q = np.array([flows.get(p['id'], series_flow) for p in pipes_config.values()], dtype=float)
+    velocity = calculate_velocity(q, diameters)
+    head_loss = np.sign(q) * calculate_head_loss(lengths, diameters, np.abs(velocity), g, roughness, nu)
+    pipe_velocities = dict(zip(pipes_config, velocity.tolist()))
+
+    # 2. Heads: start from an arbitrary reference head at the source
+    source = next((n['id'] for n in nodes_config.values() if n.get('type') == 'source'),
+                  next(iter(nodes_config.values()))['id'])
+    adjacency = defaultdict(list)
+    for p, hl in zip(pipes_config.values(), head_loss.tolist()):
+        adjacency[p['start_node']].append((p['end_node'], -hl))
+        adjacency[p['end_node']].append((p['start_node'], hl))
+
+    node_heads = {source: 100.0}
+    queue = deque([source])
+    while queue:
+        u = queue.popleft()
+        for v, change in adjacency[u]:
+            if v not in node_heads:
+                node_heads[v] = node_heads[u] + change
+                queue.append(v)
+
+    return node_heads, pipe_velocities
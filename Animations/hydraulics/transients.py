@@ -0,0 +1,172 @@
+"""Water hammer in series pipelines by the method of characteristics (MOC).
+
+A reservoir feeds a chain of pipes that discharges through a valve at the
+downstream end. Every pipe is split into reaches of length a * dt, so the
+characteristics C+ and C- land exactly on grid points:
+
+    C+:  H_P = H_A + B Q_A - R Q_A |Q_A| - B Q_P
+    C-:  H_P = H_B - B Q_B + R Q_B |Q_B| + B Q_P
+
+with B = a / (g A) and R = f dx / (2 g D A^2). All interior sections of all
+pipes update in one array operation per time step. Junctions, the reservoir
+and the valve are boundary conditions on the same arrays.
+"""
+import numpy as np
+
+from .friction import friction_factor
+from .series_parallel import _pipe_arrays
+
+
+def _series_order(pipes_config):
+    """Pipe keys ordered from the upstream end along start_node -> end_node."""
+    by_start = {p['start_node']: key for key, p in pipes_config.items()}
+    if len(by_start) != len(pipes_config):
+        raise ValueError("Pipes do not form a single series chain")
+    ends = {p['end_node'] for p in pipes_config.values()}
+    heads = [n for n in by_start if n not in ends]
+    if len(heads) != 1:
+        raise ValueError("Pipes do not form a single series chain")
+
+    order = []
+    node = heads[0]
+    while node in by_start and len(order) < len(pipes_config):
+        order.append(by_start[node])
+        node = pipes_config[by_start[node]]['end_node']
+    if len(order) != len(pipes_config):
+        raise ValueError("Pipes do not form a single series chain")
+    return order
+
+
+def valve_closure(t, closure_time, exponent=1.0):
+    """Relative valve opening tau(t) = (1 - t / closure_time)^exponent, 0 once closed."""
+    if closure_time <= 0:
+        return 0.0
+    return max(0.0, 1.0 - t / closure_time)**exponent
+
+
+def simulate_valve_closure(pipes_config, phys_config, flow_rate, reservoir_head, closure_time, duration,
+                           wave_speed=1200.0, reaches=10, closure_exponent=1.0, store_every=1, dtype=np.float64):
+    """
+    Head and flow transients after closing the downstream valve of a series
+    pipeline, starting from steady flow.
+
+    The time step is set so the pipe with the shortest wave travel time gets
+    `reaches` reaches; other pipes get a whole number of reaches and their
+    wave speed is adjusted slightly to fit. Friction factors come from the
+    steady Reynolds number and stay fixed during the transient.
+
+    Args:
+        pipes_config (dict): Series pipes with 'start_node', 'end_node',
+            'length', 'diameter_mm' and optionally 'roughness_mm' and
+            'wave_speed' (m/s).
+        phys_config (dict): Physics settings (viscosity, roughness, gravity,
+            optional 'wave_speed').
+        flow_rate (float): Steady flow before closure (m^3/s, > 0).
+        reservoir_head (float): Upstream reservoir head above the valve outlet (m).
+        closure_time (float): Valve closure time (s); 0 closes instantly.
+        duration (float): Simulated time (s).
+        wave_speed (float): Default pressure wave speed (m/s).
+        reaches (int): Reaches in the pipe with the shortest travel time.
+        closure_exponent (float): Exponent of the closure law (see valve_closure).
+        store_every (int): Keep every n-th time step in 'head'/'flow'.
+        dtype: Storage dtype for 'head'/'flow'; np.float32 halves memory.
+            The march itself always runs in float64.
+
+    Returns:
+        dict:
+            - 'time': (T,) stored times (s).
+            - 'x': (M,) distance of every section from the reservoir (m);
+              junction sections appear once per adjoining pipe.
+            - 'head', 'flow': (T, M) stored heads (m) and flows (m^3/s).
+            - 'max_head', 'min_head': (M,) envelopes over every time step.
+            - 'valve_head': (n_steps + 1,) head upstream of the valve.
+            - 'dt': Time step (s).
+            - 'wave_speed': Adjusted wave speed per pipe (m/s).
+    """
+    order = _series_order(pipes_config)
+    pipes = {key: pipes_config[key] for key in order}
+    g = float(phys_config.get('gravity', 9.81))
+    nu = float(phys_config.get('kinematic_viscosity', 1.0e-6))
+    lengths, diameters, roughness = _pipe_arrays(pipes, phys_config)
+    default_speed = float(phys_config.get('wave_speed', wave_speed))
+    speeds = np.array([p.get('wave_speed', default_speed) for p in pipes.values()], dtype=float)
+    area = np.pi * (diameters / 2)**2
+    f = friction_factor(abs(flow_rate) / area * diameters / nu, roughness, diameters)
+
+    # Grid: integer reaches per pipe at a common time step
+    dt = (lengths / speeds).min() / reaches
+    n_reaches = np.maximum(1, np.round(lengths / (speeds * dt)).astype(int))
+    speeds = lengths / (n_reaches * dt)
+    dx = lengths / n_reaches
+
+    # Per-section constants; each pipe owns n_reaches + 1 sections
+    sizes = n_reaches + 1
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    ends = starts + sizes - 1
+    n_sections = sizes.sum()
+    B = np.repeat(speeds / (g * area), sizes)
+    R = np.repeat(f * dx / (2 * g * diameters * area**2), sizes)
+    x = np.concatenate([offset + np.arange(n + 1) * step for offset, n, step in
+                        zip(np.concatenate([[0], np.cumsum(lengths)[:-1]]), n_reaches, dx)])
+
+    # Steady state consistent with the discretized friction term
+    drop = R * flow_rate * abs(flow_rate)
+    drop[starts] = 0.0
+    H = reservoir_head - np.cumsum(drop)
+    Q = np.full(n_sections, float(flow_rate))
+    h_valve = H[-1]
+    if h_valve <= 0:
+        raise ValueError("Steady head at the valve must be positive; raise reservoir_head or lower flow_rate")
+
+    n_steps = int(np.ceil(duration / dt))
+    stored = np.arange(0, n_steps + 1, store_every)
+    head_out = np.empty((len(stored), n_sections), dtype=dtype)
+    flow_out = np.empty((len(stored), n_sections), dtype=dtype)
+    head_out[0], flow_out[0] = H, Q
+    max_head, min_head = H.copy(), H.copy()
+    valve_head = np.empty(n_steps + 1)
+    valve_head[0] = h_valve
+
+    B_up, B_down = B[ends[:-1]], B[starts[1:]]
+    CP = np.empty(n_sections)
+    CM = np.empty(n_sections)
+    friction = np.empty(n_sections)
+    row = 1
+    for step in range(1, n_steps + 1):
+        np.multiply(R, Q * np.abs(Q), out=friction)
+        # C+ arrives at section i from i-1, C- from i+1 (section 0 / M-1 unused)
+        CP[1:] = H[:-1] + B[1:] * Q[:-1] - friction[:-1]
+        CM[:-1] = H[1:] - B[:-1] * Q[1:] + friction[1:]
+
+        # Interior sections of every pipe at once
+        H = 0.5 * (CP + CM)
+        Q = (CP - CM) / (2 * B)
+
+        # Upstream reservoir
+        H[0] = reservoir_head
+        Q[0] = (reservoir_head - CM[0]) / B[0]
+
+        # Series junctions: shared head, continuity of flow
+        if len(starts) > 1:
+            q_junction = (CP[ends[:-1]] - CM[starts[1:]]) / (B_up + B_down)
+            h_junction = CP[ends[:-1]] - B_up * q_junction
+            Q[ends[:-1]] = Q[starts[1:]] = q_junction
+            H[ends[:-1]] = H[starts[1:]] = h_junction
+
+        # Downstream valve: Q = tau Q0 sqrt(H / H0) combined with C+
+        cv = (valve_closure(step * dt, closure_time, closure_exponent) * flow_rate)**2 / (2 * h_valve)
+        Q[-1] = -B[-1] * cv + np.sqrt((B[-1] * cv)**2 + 2 * cv * CP[-1]) if cv > 0 else 0.0
+        H[-1] = CP[-1] - B[-1] * Q[-1]
+
+        np.maximum(max_head, H, out=max_head)
+        np.minimum(min_head, H, out=min_head)
+        valve_head[step] = H[-1]
+        if row < len(stored) and stored[row] == step:
+            head_out[row], flow_out[row] = H, Q
+            row += 1
+
+    return {
+        'time': stored * dt, 'x': x, 'head': head_out, 'flow': flow_out,
+        'max_head': max_head, 'min_head': min_head, 'valve_head': valve_head,
+        'dt': dt, 'wave_speed': dict(zip(order, speeds.tolist())),
+    }
@@ -1,16 +1,17 @@
 """
 Utility functions for configuration loading.
 """
-import yaml
-import os
+from hydraulics.cache import load_yaml
 
 
-def load_config(file_path):
+def load_config(file_path, required=()):
     """
-    Loads a YAML configuration file.
+    Loads a YAML configuration file, reusing the parsed result cached next
+    to it while the file is unchanged.
     
     Args:
         file_path: Path to the YAML configuration file.
+        required: Top-level sections the file must define.
         
     Returns:
         dict: Parsed configuration data.
@@ -18,14 +19,6 @@ def load_config(file_path):
     Raises:
         FileNotFoundError: If the configuration file doesn't exist.
         yaml.YAMLError: If the YAML file is malformed.
+        ValueError: If the file is not a mapping or lacks a required section.
     """
-    abs_path = os.path.abspath(file_path)
-    if not os.path.exists(abs_path):
-        raise FileNotFoundError(f"Configuration file not found: {abs_path}")
-        
-    with open(abs_path, 'r') as f:
-        try:
-            config = yaml.safe_load(f)
-            return config
-        except yaml.YAMLError as e:
-            raise yaml.YAMLError(f"Error parsing YAML file {abs_path}: {e}")
+    return load_yaml(file_path, required)
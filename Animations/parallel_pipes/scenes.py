@@ -8,22 +8,29 @@ import random
 import sys
 import os
 
-# Add helpers to path
+# Import helpers/ from this folder and the shared hydraulics package and
+# render_profiles from the Animations folder above it
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from helpers.utils import load_config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from helpers.geometry import create_system_mobjects
-from helpers.physics import calculate_parallel_flows, calculate_system_heads
+from helpers import ConfigCache, solve_series_parallel, calculate_system_heads
 from helpers.annotations import create_flow_label, create_head_label, create_flow_arrow
+from render_profiles import apply_profile, seed_scene
 
-# Load configuration
+# Load configuration (parsed YAML and solved flows/heads are cached next to it)
 script_dir = os.path.dirname(os.path.abspath(__file__))
-INPUTS = load_config(os.path.join(script_dir, 'inputs.yaml'))
+CACHE = ConfigCache(os.path.join(script_dir, 'inputs.yaml'), required=('network', 'display', 'physics'))
+INPUTS = CACHE.config
+PROFILE = apply_profile(config)
 
 
 class ParallelPipesScene(Scene):
     """Main scene demonstrating parallel pipe flow."""
     
     def construct(self):
+        # Same particle offsets in every render (see render_profiles.seed_scene)
+        seed_scene(self)
+
         # Load configuration
         nodes_cfg = INPUTS['network']['nodes']
         pipes_cfg = INPUTS['network']['pipes']
@@ -73,47 +80,47 @@ class ParallelPipesScene(Scene):
         self.play(Create(walls), run_time=1.5)
 
         # --- Annotations & Physics Calcs ---
-        # 1. Calculate Flows
+        # Merging physics inputs for convenience
+        combined_phys = {**INPUTS['physics']['fluid'], **INPUTS['physics']}
+
+        # 1. Calculate Flows (branches balanced to equal head loss)
         total_q = phys_cfg['total_flow_rate']
-        parallel_data = [pipes_cfg[f'pipe_{pid}'] for pid in ['A', 'B', 'C']]
-        flows = calculate_parallel_flows(total_q, parallel_data)
-        flows['inlet'] = total_q
-        flows['outlet'] = total_q
+        flows = CACHE.get('flows', solve_series_parallel, pipes_cfg, total_q, combined_phys)
         
         # 2. Calculate Heads and Velocities
-        # Merging physics inputs for convenience
-        combined_phys = {**INPUTS['physics']['fluid'], **INPUTS['physics']}
-        node_heads, pipe_velocities = calculate_system_heads(nodes_cfg, pipes_cfg, flows, combined_phys)
+        node_heads, pipe_velocities = CACHE.get('heads', calculate_system_heads, nodes_cfg, pipes_cfg, flows, combined_phys)
         
         # Create Flow Labels
         annotations_labels = VGroup()
         
-        flow_lbl_inlet = create_flow_label(pipes['pipe_inlet'][1], flows['inlet'], "inlet", direction=UP, buff=0.6)
-        flow_lbl_outlet = create_flow_label(pipes['pipe_outlet'][1], flows['outlet'], "outlet", direction=UP, buff=0.6)
-        flow_lbl_A = create_flow_label(pipes['pipe_A'][1], flows['A'], "A", direction=UP, buff=0.6)
-        flow_lbl_B = create_flow_label(pipes['pipe_B'][1], flows['B'], "B", direction=UP, buff=0.6)
-        flow_lbl_C = create_flow_label(pipes['pipe_C'][1], flows['C'], "C", direction=DOWN, buff=0.6)
+        # Flow and head labels are MathTex; draft renders skip building them
+        if PROFILE.annotations:
+            flow_lbl_inlet = create_flow_label(pipes['pipe_inlet'][1], flows['inlet'], "inlet", direction=UP, buff=0.6)
+            flow_lbl_outlet = create_flow_label(pipes['pipe_outlet'][1], flows['outlet'], "outlet", direction=UP, buff=0.6)
+            flow_lbl_A = create_flow_label(pipes['pipe_A'][1], flows['A'], "A", direction=UP, buff=0.6)
+            flow_lbl_B = create_flow_label(pipes['pipe_B'][1], flows['B'], "B", direction=UP, buff=0.6)
+            flow_lbl_C = create_flow_label(pipes['pipe_C'][1], flows['C'], "C", direction=DOWN, buff=0.6)
 
-        # annotations_labels.add(flow_lbl_inlet, flow_lbl_outlet, flow_lbl_A, flow_lbl_B, flow_lbl_C)
-        flow_lbls = VGroup(flow_lbl_inlet, flow_lbl_A, flow_lbl_B, flow_lbl_C, flow_lbl_outlet)
-        self.play(Create(flow_lbls), run_time=0.5)
+            # annotations_labels.add(flow_lbl_inlet, flow_lbl_outlet, flow_lbl_A, flow_lbl_B, flow_lbl_C)
+            flow_lbls = VGroup(flow_lbl_inlet, flow_lbl_A, flow_lbl_B, flow_lbl_C, flow_lbl_outlet)
+            self.play(Create(flow_lbls), run_time=0.5)
 
-        # Head Labels at Nodes
-        # Start Node (0), Junction 1 (1), Junction 2 (2), End Node (3)
-        for nid, val in node_heads.items():
-            if nid in nodes_mobs:
-                pos = nodes_mobs[nid].get_center()
+            # Head Labels at Nodes
+            # Start Node (0), Junction 1 (1), Junction 2 (2), End Node (3)
+            for nid, val in node_heads.items():
+                if nid in nodes_mobs:
+                    pos = nodes_mobs[nid].get_center()
                 
-                label_offset = UP * 1.8 # General high placement
-                if nid == 0: # Inlet Start
-                     label_offset = UP * 1.2
-                elif nid == 1: # Split
-                     label_offset = UP * 1.2 + LEFT * 0.5
-                elif nid == 2: # Merge
-                     label_offset = UP * 1.2 + RIGHT * 0.5
+                    label_offset = UP * 1.8 # General high placement
+                    if nid == 0: # Inlet Start
+                         label_offset = UP * 1.2
+                    elif nid == 1: # Split
+                         label_offset = UP * 1.2 + LEFT * 0.5
+                    elif nid == 2: # Merge
+                         label_offset = UP * 1.2 + RIGHT * 0.5
                 
-                head_lbl = create_head_label(val, pos + label_offset)
-                annotations_labels.add(head_lbl)
+                    head_lbl = create_head_label(val, pos + label_offset)
+                    annotations_labels.add(head_lbl)
         
         # Layering: Annotations on top
         # annotations_labels.set_z_index(10)
@@ -2,9 +2,16 @@
 
 This package contains modular helpers for:
 - config: Configuration loading
-- physics: Velocity profiles and EGL/HGL calculations
 - visuals: Velocity profile graphics, particles, and updaters
+
+Velocity profiles and EGL/HGL calculations come from the shared hydraulics package.
 """
+from hydraulics.profiles import (
+    get_open_channel_velocity, get_closed_pipe_velocity, tabulate_profile,
+    calculate_uniform_egl_hgl
+)
+
 from .inputs_loader import load_inputs
-from .physics import get_open_channel_velocity, get_closed_pipe_velocity, calculate_egl_hgl
-from .visuals import create_axes, create_velocity_profile_visuals, create_particles, get_particle_updater
+from .visuals import (
+    ParticleCloud, create_axes, create_velocity_profile_visuals, create_particles, get_particle_updater
+)
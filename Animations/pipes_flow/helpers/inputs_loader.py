@@ -1,15 +1,15 @@
 """Configuration loading utilities."""
-import yaml
+from hydraulics.cache import load_yaml
 
 
-def load_inputs(inputs_path):
-    """Loads a YAML inputs file.
+def load_inputs(inputs_path, required=()):
+    """Loads a YAML inputs file (cached next to it, see hydraulics.cache).
 
     Args:
         inputs_path (str): The absolute path to the YAML inputs file.
+        required (tuple): Top-level sections the file must define.
 
     Returns:
         dict: The inputs dictionary loaded from the file.
     """
-    with open(inputs_path, 'r') as f:
-        return yaml.safe_load(f)
+    return load_yaml(inputs_path, required)
@@ -25,18 +25,21 @@ def create_axes(x_range, y_range, config_dict=None):
     )
 
 
-def create_velocity_profile_visuals(axes, velocity_func, y_range, x_profile, v_viz_scale, v_max, num_arrows=9, color=BLACK):
+def create_velocity_profile_visuals(axes, velocity_func, y_range, x_profile, v_viz_scale, v_max, num_arrows=9, color=BLACK,
+                                    label=True):
     """Creates velocity profile visualization with curve, fill, arrows, and label.
 
     Args:
         axes: The Axes object.
-        velocity_func: Function returning velocity for a given y.
+        velocity_func: Function returning velocity for a given y (or array of y).
         y_range: Tuple (y_min, y_max).
         x_profile: X-position of the profile.
         v_viz_scale: Visual scale factor for velocity.
         v_max: Maximum velocity for label positioning.
         num_arrows: Number of arrows to display.
         color: Profile color.
+        label: Build the MathTex velocity label; if False an empty VGroup
+            takes its place (draft renders).
 
     Returns:
         VGroup: Profile curve, fill, arrows, and label.
@@ -54,21 +57,19 @@ def create_velocity_profile_visuals(axes, velocity_func, y_range, x_profile, v_v
         color=color
     )
 
-    # Filled Profile Area
-    fill_points = [axes.c2p(x_profile, y_min)]
+    # Filled Profile Area (profile evaluated once over all sample heights)
     steps = 40
-    for i in range(steps + 1):
-        t = y_min + (i/steps) * (y_max - y_min)
-        val = x_profile + velocity_func(t) * v_viz_scale
-        fill_points.append(axes.c2p(val, t))
+    t = np.linspace(y_min, y_max, steps + 1)
+    vals = x_profile + np.asarray(velocity_func(t)) * v_viz_scale
+    fill_points = [axes.c2p(x_profile, y_min)]
+    fill_points.extend(axes.c2p(val, y) for val, y in zip(vals, t))
     fill_points.append(axes.c2p(x_profile, y_max))
     profile_fill = Polygon(*fill_points, color=color, fill_opacity=0.3, stroke_width=0)
 
     # Arrows
     arrows = VGroup()
-    for i in range(num_arrows + 1):
-        y = y_min + (i/num_arrows) * (y_max - y_min)
-        v = velocity_func(y)
+    arrow_y = np.linspace(y_min, y_max, num_arrows + 1)
+    for y, v in zip(arrow_y, np.asarray(velocity_func(arrow_y))):
         start_pt = axes.c2p(x_profile, y)
         end_pt = axes.c2p(x_profile + v * v_viz_scale, y)
         if v > 0.1:
@@ -78,11 +79,40 @@ def create_velocity_profile_visuals(axes, velocity_func, y_range, x_profile, v_v
     # Velocity Label
     y_v_label = y_min + 0.6 * (y_max - y_min)
     v_label_pos = axes.c2p(x_profile + v_max * v_viz_scale + 0.5, y_v_label)
-    v_label = MathTex(r"\vec{v}", color=color, font_size=70).move_to(v_label_pos)
+    v_label = MathTex(r"\vec{v}", color=color, font_size=70).move_to(v_label_pos) if label else VGroup()
 
     return VGroup(profile_curve, profile_fill, arrows, v_label)
 
 
+class ParticleCloud(VMobject):
+    """All flow particles as one VMobject, one circle subpath per particle.
+
+    Particle coordinates live in `virt_pos`, an (N, 3) array in axes
+    coordinates, and a frame update is a single write of all points.
+    """
+    def __init__(self, virt_pos, radius=0.05, color=BLACK, **kwargs):
+        super().__init__(color=color, fill_opacity=1, stroke_width=0, **kwargs)
+        self.virt_pos = np.asarray(virt_pos, dtype=float)
+        self.template = Dot(radius=radius).points.copy()
+        self.set_points(np.zeros((len(self.virt_pos) * len(self.template), 3)))
+
+    def move_particles(self, scene_pos):
+        """Centers particle i at scene_pos[i] for an (N, 3) array of scene points."""
+        self.points = (scene_pos[:, None, :] + self.template[None, :, :]).reshape(-1, 3)
+        return self
+
+
+def get_scene_transform(axes, slope_angle=0):
+    """Affine map from axes (x, y) to rotated scene points as a 3x3 matrix.
+
+    Linear axes make c2p affine, so scene = M @ [x, y, 1] reproduces
+    rotate_vector(axes.c2p(x, y), slope_angle) for all points in one product.
+    """
+    origin = np.array(axes.c2p(0, 0))
+    basis = np.column_stack([np.array(axes.c2p(1, 0)) - origin, np.array(axes.c2p(0, 1)) - origin, origin])
+    return rotation_matrix(slope_angle, OUT) @ basis
+
+
 def create_particles(axes, velocity_func, x_bounds, y_bounds, slope_angle=0, num_particles=50):
     """Creates particle dots for flow visualization.
 
@@ -95,31 +125,30 @@ def create_particles(axes, velocity_func, x_bounds, y_bounds, slope_angle=0, num
         num_particles: Number of particles.
 
     Returns:
-        VGroup: Particle dots.
+        ParticleCloud: Particle dots.
     """
-    particles = VGroup()
     x_start, x_end = x_bounds
     y_min, y_max = y_bounds
-    
-    for _ in range(num_particles):
-        dot = Dot(radius=0.05, color=BLACK)
-        vx = random.uniform(x_start, x_end)
-        vy = random.uniform(y_min, y_max)
-        dot.virt_pos = np.array([vx, vy, 0])
-        base_pos = axes.c2p(vx, vy)
-        dot.move_to(rotate_vector(base_pos, slope_angle))
-        particles.add(dot)
-        
-    return particles
+
+    virt_pos = np.zeros((num_particles, 3))
+    virt_pos[:, 0] = np.random.uniform(x_start, x_end, num_particles)
+    virt_pos[:, 1] = np.random.uniform(y_min, y_max, num_particles)
+    particles = ParticleCloud(virt_pos)
+    transform = get_scene_transform(axes, slope_angle)
+    return particles.move_particles(virt_pos[:, :2] @ transform[:, :2].T + transform[:, 2])
 
 
 def get_particle_updater(axes, particles, velocity_func, x_bounds, slope_angle=0):
     """Returns an updater function for particle animation.
 
+    Particles keep their y, so their speeds are evaluated once here in one
+    array call; each frame then advances, wraps and places all particles
+    with array operations.
+
     Args:
         axes: The Axes object.
-        particles: VGroup of particles.
-        velocity_func: Velocity function.
+        particles: ParticleCloud from create_particles.
+        velocity_func: Array-capable velocity function.
         x_bounds: Tuple (x_start, x_end).
         slope_angle: Rotation angle.
 
@@ -127,16 +156,13 @@ def get_particle_updater(axes, particles, velocity_func, x_bounds, slope_angle=0
         function: Updater function for particles.
     """
     x_start, x_end = x_bounds
+    transform = get_scene_transform(axes, slope_angle)
+    speeds = 0.5 * np.asarray(velocity_func(particles.virt_pos[:, 1]), dtype=float)
     
     def update_particles(mob, dt):
-        for dot in mob:
-            vx, vy, _ = dot.virt_pos
-            v = velocity_func(vy)
-            vx_new = vx + v * dt * 0.5
-            if vx_new > x_end:
-                vx_new = x_start
-            dot.virt_pos = np.array([vx_new, vy, 0])
-            raw_pos = axes.c2p(vx_new, vy)
-            dot.move_to(rotate_vector(raw_pos, slope_angle))
+        pos = mob.virt_pos
+        pos[:, 0] += speeds * dt
+        pos[pos[:, 0] > x_end, 0] = x_start
+        mob.move_particles(pos[:, :2] @ transform[:, :2].T + transform[:, 2])
     
     return update_particles
@@ -3,22 +3,27 @@ import numpy as np
 import os
 import sys
 
-# Ensure we can import from the same directory
+# Import helpers/ from this folder and the shared hydraulics package and
+# render_profiles from the Animations folder above it
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from helpers import (
     load_inputs, get_open_channel_velocity, get_closed_pipe_velocity,
     create_axes, create_velocity_profile_visuals, create_particles, get_particle_updater
 )
+from render_profiles import apply_profile, seed_scene
 
 # Load configuration
 script_dir = os.path.dirname(os.path.abspath(__file__))
-INPUTS = load_inputs(os.path.join(script_dir, 'inputs.yaml'))
+INPUTS = load_inputs(os.path.join(script_dir, 'inputs.yaml'), required=('scenes', 'global'))
 GLOBAL_INPUTS = INPUTS['global']
+PROFILE = apply_profile(config)
 
 
 class OpenChannelProfile(Scene):
     def construct(self):
+        seed_scene(self)
         cfg = INPUTS['scenes']['open_channel']
         geom = cfg['geometry']
         vis = cfg['visuals']
@@ -89,7 +94,8 @@ class OpenChannelProfile(Scene):
             y_range=[y_bed, y_surface],
             x_profile=0,
             v_viz_scale=GLOBAL_INPUTS['animation']['viz_scale_factor'],
-            v_max=v_max
+            v_max=v_max,
+            label=PROFILE.annotations
         )
         profile_curve, profile_fill, arrows, v_label = profile_group
 
@@ -108,13 +114,16 @@ class OpenChannelProfile(Scene):
         particles.add_updater(updater)
         
         self.wait(GLOBAL_INPUTS['animation']['wait_time_before_particles'])
-        self.play(Create(arrows), Create(profile_curve), FadeIn(profile_fill), Write(v_label))
+        # Draft profile: v_label is an empty VGroup, nothing to write
+        label_writes = [Write(v_label)] if PROFILE.annotations else []
+        self.play(Create(arrows), Create(profile_curve), FadeIn(profile_fill), *label_writes)
         self.wait(GLOBAL_INPUTS['animation']['wait_time_after_particles_start'])
         particles.remove_updater(updater)
 
 
 class GravityPipeProfile(Scene):
     def construct(self):
+        seed_scene(self)
         cfg = INPUTS['scenes']['gravity_pipe']
         geom = cfg['geometry']
         vis = cfg['visuals']
@@ -172,7 +181,8 @@ class GravityPipeProfile(Scene):
             x_profile=0,
             v_viz_scale=GLOBAL_INPUTS['animation']['viz_scale_factor'],
             v_max=v_max,
-            num_arrows=vis['num_arrows']
+            num_arrows=vis['num_arrows'],
+            label=PROFILE.annotations
         )
         profile_curve, profile_fill, arrows, v_label = profile_group
 
@@ -191,13 +201,16 @@ class GravityPipeProfile(Scene):
         particles.add_updater(updater)
         
         self.wait(GLOBAL_INPUTS['animation']['wait_time_before_particles'])
-        self.play(Create(arrows), Create(profile_curve), FadeIn(profile_fill), Write(v_label))
+        # Draft profile: v_label is an empty VGroup, nothing to write
+        label_writes = [Write(v_label)] if PROFILE.annotations else []
+        self.play(Create(arrows), Create(profile_curve), FadeIn(profile_fill), *label_writes)
         self.wait(GLOBAL_INPUTS['animation']['wait_time_after_particles_start'])
         particles.remove_updater(updater)
 
 
 class ClosedPipeProfile(Scene):
     def construct(self):
+        seed_scene(self)
         cfg = INPUTS['scenes']['closed_pipe']
         geom = cfg['geometry']
         vis = cfg['visuals']
@@ -249,7 +262,8 @@ class ClosedPipeProfile(Scene):
             x_profile=0,
             v_viz_scale=GLOBAL_INPUTS['animation']['closed_pipe_viz_scale'],
             v_max=v_max,
-            num_arrows=vis['num_arrows']
+            num_arrows=vis['num_arrows'],
+            label=PROFILE.annotations
         )
         profile_curve, profile_fill, arrows, v_label = profile_group
 
@@ -267,6 +281,8 @@ class ClosedPipeProfile(Scene):
         particles.add_updater(updater)
         
         self.wait(GLOBAL_INPUTS['animation']['wait_time_before_particles'])
-        self.play(Create(arrows), Create(profile_curve), FadeIn(profile_fill), Write(v_label))
+        # Draft profile: v_label is an empty VGroup, nothing to write
+        label_writes = [Write(v_label)] if PROFILE.annotations else []
+        self.play(Create(arrows), Create(profile_curve), FadeIn(profile_fill), *label_writes)
         self.wait(GLOBAL_INPUTS['animation']['wait_time_after_particles_start'])
         particles.remove_updater(updater)
@@ -0,0 +1,412 @@
+"""
+Renders every animation scene in this directory, skipping up-to-date ones.
+
+Scene classes are discovered by parsing each `<folder>/scenes.py` (classes
+deriving from a *Scene base). A scene is stale when its video is missing
+from the folder's video_dir (see manim.cfg) or when the hash of its inputs
+changed: the folder's Python sources, inputs.yaml and manim.cfg plus the
+shared hydraulics package and render profiles, the manim arguments and the
+render profile. Stale scenes render in parallel `manim` processes, each run
+from its own folder so its manim.cfg applies unless --profile (or the
+RENDER_PROFILE environment variable) picks a profile from render_profiles.py.
+
+With --segments K a scene's timeline is split into K ranges of play()/wait()
+calls. Each range renders in its own process (`manim -n start,end`) with its
+own media and partial movie directories, and the pieces are joined losslessly
+with ffmpeg's concat demuxer (stream copy). A planning pass first runs the
+scene as a low frame rate dry run that records manim's hash of each play
+(its animations and the mobjects on screen) and its duration; ranges are cut
+at about equal running time. A segment is keyed by the hashes of its own
+plays plus manim.cfg and the render options, so an edit re-renders only the
+segments whose plays it changed, and an interrupted or partly failed render
+only redoes the missing ones. The input hash stamps the joined video.
+
+A segment process fast-forwards through the plays before its range, which
+applies a time-based (dt) updater once per skipped play instead of once per
+frame. Scenes whose plans show such updaters therefore render whole. Scenes
+that use random numbers seed them with render_profiles.seed_scene so that
+every process draws the same values.
+
+Usage:
+    python render_all.py                      # render stale scenes, one process per core
+    python render_all.py pipes_flow --jobs 2  # only scenes in pipes_flow
+    python render_all.py --list               # show scenes and whether they are stale
+    python render_all.py --force SeriesPipesScene
+    python render_all.py WaterDistributionScene --segments 8
+    python render_all.py --profile draft      # 480p, 15 fps, no annotations
+"""
+import argparse
+import ast
+import bisect
+import configparser
+import glob
+import hashlib
+import importlib.util
+import itertools
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from render_profiles import ENV_VAR, PROFILES
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SHARED_SOURCES = os.path.join(ROOT, 'hydraulics')
+
+
+def discover_scenes(root=ROOT):
+    """
+    Finds scene classes without importing manim.
+
+    Returns:
+        list: (folder, class name) pairs in folder and source order.
+    """
+    scenes = []
+    for path in sorted(glob.glob(os.path.join(root, '*', 'scenes.py'))):
+        with open(path) as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in tree.body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            bases = [b.id if isinstance(b, ast.Name) else getattr(b, 'attr', '') for b in node.bases]
+            if any(base.endswith('Scene') for base in bases):
+                scenes.append((os.path.dirname(path), node.name))
+    return scenes
+
+
+def input_files(folder):
+    """Files whose contents determine a folder's renders."""
+    files = glob.glob(os.path.join(folder, '**', '*.py'), recursive=True)
+    files += glob.glob(os.path.join(SHARED_SOURCES, '*.py'))
+    files.append(os.path.join(ROOT, 'render_profiles.py'))
+    files += [os.path.join(folder, name) for name in ('inputs.yaml', 'manim.cfg')]
+    return sorted(f for f in files if os.path.exists(f) and os.sep + 'results' + os.sep not in f)
+
+
+def input_hash(folder, scene_name, extra=''):
+    """SHA-256 over the scene name, `extra` (e.g. render options) and all input files."""
+    h = hashlib.sha256(f"{scene_name}\0{extra}\0".encode())
+    for path in input_files(folder):
+        h.update(os.path.relpath(path, ROOT).encode())
+        with open(path, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def video_dir(folder):
+    """The folder's video_dir from manim.cfg (results/videos/scenes by default)."""
+    cfg = configparser.ConfigParser(inline_comment_prefixes=('#',))
+    cfg.read(os.path.join(folder, 'manim.cfg'))
+    return os.path.normpath(os.path.join(folder, cfg.get('CLI', 'video_dir', fallback='results/videos/scenes')))
+
+
+def render_paths(folder, scene_name):
+    """(video path, hash sidecar path) of a scene."""
+    out = video_dir(folder)
+    return os.path.join(out, f"{scene_name}.mp4"), os.path.join(out, f"{scene_name}.inputs.sha256")
+
+
+def is_stale(folder, scene_name, digest):
+    video, stamp = render_paths(folder, scene_name)
+    if not (os.path.exists(video) and os.path.exists(stamp)):
+        return True
+    with open(stamp) as f:
+        return f.read().strip() != digest
+
+
+def render_scene(folder, scene_name, digest, manim_args=()):
+    """
+    Renders one scene in a `manim` subprocess and records its input hash.
+
+    Returns:
+        tuple: (returncode, elapsed seconds, log tail)
+    """
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-m', 'manim', *manim_args, 'scenes.py', scene_name],
+        cwd=folder, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - start
+    if proc.returncode == 0:
+        _, stamp = render_paths(folder, scene_name)
+        with open(stamp, 'w') as f:
+            f.write(digest + '\n')
+    return proc.returncode, elapsed, (proc.stdout + proc.stderr)[-2000:]
+
+
+def plan_scene(scene_name):
+    """
+    Runs in the scene's folder (see --plan): a dry run at 1 fps and low
+    resolution, printing as JSON manim's hash of every play call (of its
+    animations and the mobjects on screen, as used for manim's own partial
+    movie cache), the play durations and whether any play ran with a
+    time-based updater. Imports manim, so it is only called in a subprocess.
+    """
+    from manim import config
+
+    spec = importlib.util.spec_from_file_location('scenes', os.path.abspath('scenes.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    # Scenes may set config at import; the planning overrides come after
+    frame_width, frame_height = config.frame_width, config.frame_height
+    config.dry_run = True
+    # Caching on so the renderer hashes every play; a dry run writes no files
+    config.disable_caching = False
+    config.frame_rate = 1
+    config.pixel_width, config.pixel_height = 256, 144
+    config.frame_width, config.frame_height = frame_width, frame_height
+    scene = getattr(module, scene_name)()
+
+    # Checked before and after each play (wait() goes through play())
+    time_based = []
+    durations = []
+    play = scene.play
+
+    def checked_play(*args, **kwargs):
+        time_based.append(any(m.has_time_based_updater() for m in scene.get_mobject_family_members()))
+        play(*args, **kwargs)
+        durations.append(scene.duration)
+        time_based[-1] |= any(m.has_time_based_updater() for m in scene.get_mobject_family_members())
+
+    scene.play = checked_play
+    scene.render()
+    print(json.dumps({'hashes': scene.renderer.animations_hashes, 'durations': durations,
+                      'time_based_updaters': any(time_based)}))
+
+
+def plan_segments(folder, scene_name, n_segments, options=''):
+    """
+    Splits a scene into up to n_segments ranges of play calls with about
+    equal running time.
+
+    Returns:
+        list: (start, end, key) with inclusive play indices; key hashes the
+            manim hashes of the plays in the range, the folder's manim.cfg
+            and the render `options` (profile and manim arguments), so a
+            segment is only re-rendered when its own plays changed. None when
+            the scene has time-based updaters or fewer than 2 plays and must
+            render whole.
+    """
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--plan', scene_name],
+        cwd=folder, capture_output=True, text=True, check=True
+    )
+    plan = json.loads(proc.stdout.strip().splitlines()[-1])
+    hashes = plan['hashes']
+    if plan['time_based_updaters'] or len(hashes) < 2:
+        return None
+    ends = list(itertools.accumulate(plan['durations']))
+    cuts = {bisect.bisect_left(ends, ends[-1] * i / n_segments) + 1 for i in range(1, n_segments)}
+    # The first range needs >= 2 plays: manim treats `-n 0,0` as "no end"
+    bounds = [0] + sorted(cut for cut in cuts if 2 <= cut < len(hashes)) + [len(hashes)]
+
+    cfg_path = os.path.join(folder, 'manim.cfg')
+    cfg = b''
+    if os.path.exists(cfg_path):
+        with open(cfg_path, 'rb') as f:
+            cfg = f.read()
+    segments = []
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        h = hashlib.sha256(f"{scene_name}\0{options}\0".encode() + cfg)
+        h.update('\0'.join(hashes[start:stop]).encode())
+        segments.append((start, stop - 1, h.hexdigest()[:16]))
+    return segments
+
+
+def segment_path(folder, scene_name, key):
+    return os.path.join(video_dir(folder), 'segments', scene_name, f"{key}.mp4")
+
+
+def segment_config(folder, work_dir):
+    """
+    Writes the folder's manim.cfg to work_dir/manim.cfg with the movie and
+    image output directories moved into work_dir, so segment processes never
+    share partial movie files (or clean up each other's). The Tex/text caches
+    under media_dir stay shared. Returns the new file's path.
+    """
+    # No interpolation: values are copied through verbatim for manim to read
+    cfg = configparser.ConfigParser(interpolation=None)
+    cfg.read(os.path.join(folder, 'manim.cfg'))
+    if not cfg.has_section('CLI'):
+        cfg.add_section('CLI')
+    for name in ('video_dir', 'images_dir', 'sections_dir', 'partial_movie_dir'):
+        cfg.set('CLI', name, os.path.join(work_dir, name))
+    path = os.path.join(work_dir, 'manim.cfg')
+    with open(path, 'w') as f:
+        cfg.write(f)
+    return path
+
+
+def render_segment(folder, scene_name, start, end, path, manim_args=()):
+    """Renders play calls start..end (inclusive) of a scene to `path`."""
+    work_dir = os.path.splitext(path)[0] + '.work'
+    os.makedirs(work_dir, exist_ok=True)
+    config_file = segment_config(folder, work_dir)
+    begin = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-m', 'manim', *manim_args, '--config_file', config_file,
+         '-n', f"{start},{end}", '-o', path, 'scenes.py', scene_name],
+        cwd=folder, capture_output=True, text=True
+    )
+    if proc.returncode == 0:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return proc.returncode, time.perf_counter() - begin, (proc.stdout + proc.stderr)[-2000:]
+
+
+def concat_segments(paths, output):
+    """Joins segment videos without re-encoding (ffmpeg concat demuxer)."""
+    list_file = output + '.segments.txt'
+    with open(list_file, 'w') as f:
+        f.writelines(f"file '{os.path.abspath(p)}'\n" for p in paths)
+    try:
+        proc = subprocess.run(
+            ['ffmpeg', '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0', '-i', list_file, '-c', 'copy', output],
+            capture_output=True, text=True
+        )
+    finally:
+        os.remove(list_file)
+    return proc.returncode, proc.stderr[-2000:]
+
+
+def render_segmented(pool, todo, args, report):
+    """
+    Plans every stale scene, renders missing segments in `pool`, then
+    concatenates. Returns the jobs of scenes that cannot be segmented.
+    """
+    plans = {}
+    whole = []
+    for job in todo:
+        folder, scene, digest, _ = job
+        start = time.perf_counter()
+        try:
+            segments = plan_segments(folder, scene, args.segments, render_options(args.manim_args))
+        except subprocess.CalledProcessError as e:
+            report[(folder, scene)] = ('FAILED', time.perf_counter() - start)
+            print(f"FAILED planning: {os.path.basename(folder)}/{scene}\n{(e.stdout + e.stderr)[-2000:]}")
+            continue
+        if segments is None:
+            print(f"{os.path.basename(folder)}/{scene} has time-based updaters; rendering it whole")
+            whole.append(job)
+            continue
+        plans[(folder, scene)] = (digest, segments)
+        report[(folder, scene)] = ('rendered', time.perf_counter() - start)
+
+    futures = {}
+    for (folder, scene), (_, segments) in plans.items():
+        for start, end, key in segments:
+            path = segment_path(folder, scene, key)
+            if args.force or not os.path.exists(path):
+                future = pool.submit(render_segment, folder, scene, start, end, path, args.manim_args)
+                futures[future] = (folder, scene, start, end)
+    for future in as_completed(futures):
+        folder, scene, start, end = futures[future]
+        returncode, elapsed, log = future.result()
+        status, total = report[(folder, scene)]
+        report[(folder, scene)] = (status if returncode == 0 else 'FAILED', total + elapsed)
+        print(f"{'done' if returncode == 0 else 'FAILED'}: {os.path.basename(folder)}/{scene} "
+              f"plays {start}-{end} ({elapsed:.1f}s)")
+        if returncode != 0:
+            print(log)
+
+    for (folder, scene), (digest, segments) in plans.items():
+        if report[(folder, scene)][0] == 'FAILED':
+            continue
+        video, stamp = render_paths(folder, scene)
+        paths = [segment_path(folder, scene, key) for _, _, key in segments]
+        returncode, log = concat_segments(paths, video)
+        if returncode != 0:
+            report[(folder, scene)] = ('FAILED', report[(folder, scene)][1])
+            print(f"FAILED concat: {os.path.basename(folder)}/{scene}\n{log}")
+            continue
+        with open(stamp, 'w') as f:
+            f.write(digest + '\n')
+        # Drop segments no longer referenced by the plan and failed segments' work dirs
+        for old in glob.glob(os.path.join(os.path.dirname(paths[0]), '*')):
+            if os.path.isdir(old):
+                shutil.rmtree(old, ignore_errors=True)
+            elif old not in paths:
+                os.remove(old)
+    return whole
+
+
+def render_options(manim_args):
+    """The render profile and manim arguments, as hashed into render keys."""
+    return f"{os.environ.get(ENV_VAR, '')}\0{' '.join(manim_args)}"
+
+
+def select(scenes, names):
+    """Scenes whose folder name or class name is in `names` (all when empty)."""
+    if not names:
+        return scenes
+    return [(folder, scene) for folder, scene in scenes if scene in names or os.path.basename(folder) in names]
+
+
+def main(args):
+    scenes = select(discover_scenes(), args.names)
+    if not scenes:
+        print("No scenes matched.")
+        return 1
+
+    # manim processes inherit the profile through the environment
+    if args.profile:
+        os.environ[ENV_VAR] = args.profile
+    extra = render_options(args.manim_args)
+
+    jobs = []
+    for folder, scene in scenes:
+        digest = input_hash(folder, scene, extra)
+        stale = args.force or is_stale(folder, scene, digest)
+        jobs.append((folder, scene, digest, stale))
+
+    if args.list:
+        for folder, scene, _, stale in jobs:
+            print(f"{os.path.basename(folder):<28} {scene:<26} {'stale' if stale else 'up to date'}")
+        return 0
+
+    report = {(folder, scene): ('up to date', 0.0) for folder, scene, _, stale in jobs if not stale}
+    todo = [job for job in jobs if job[3]]
+    total_start = time.perf_counter()
+    # Threads only wait on the manim processes, which do the work
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        if args.segments > 1:
+            todo = render_segmented(pool, todo, args, report)
+        futures = {pool.submit(render_scene, folder, scene, digest, args.manim_args): (folder, scene)
+                   for folder, scene, digest, _ in todo}
+        for future in as_completed(futures):
+            folder, scene = futures[future]
+            returncode, elapsed, log = future.result()
+            report[(folder, scene)] = ('rendered' if returncode == 0 else 'FAILED', elapsed)
+            print(f"{'done' if returncode == 0 else 'FAILED'}: {os.path.basename(folder)}/{scene} ({elapsed:.1f}s)")
+            if returncode != 0:
+                print(log)
+    total = time.perf_counter() - total_start
+
+    print(f"\n{'Folder':<28} {'Scene':<26} {'Status':<11} {'Time':>8}")
+    for folder, scene, _, _ in jobs:
+        status, elapsed = report[(folder, scene)]
+        print(f"{os.path.basename(folder):<28} {scene:<26} {status:<11} {elapsed:7.1f}s")
+    rendered = sum(status == 'rendered' for status, _ in report.values())
+    stale = sum(stale for *_, stale in jobs)
+    print(f"{rendered}/{stale} stale scenes rendered with {args.jobs} jobs in {total:.1f}s")
+    return int(any(status == 'FAILED' for status, _ in report.values()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("names", nargs="*", help="folder or scene class names to restrict to")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="parallel manim processes")
+    parser.add_argument("--force", action="store_true", help="render even if up to date")
+    parser.add_argument("--list", action="store_true", help="only list scenes and their status")
+    parser.add_argument("--segments", type=int, default=1, help="split each scene into this many parallel segments")
+    parser.add_argument("--profile", choices=PROFILES, help=f"render profile (default: ${ENV_VAR} or manim.cfg)")
+    parser.add_argument("--plan", metavar="SCENE", help=argparse.SUPPRESS)
+    parser.add_argument("--manim-args", nargs=argparse.REMAINDER, default=[],
+                        help="remaining arguments are passed to manim (e.g. --manim-args -ql)")
+    args = parser.parse_args()
+    if args.plan:
+        plan_scene(args.plan)
+        sys.exit(0)
+    sys.exit(main(args))
@@ -0,0 +1,78 @@
+"""
+Named render profiles shared by every scene.
+
+A profile fixes resolution and frame rate and says whether scenes build
+their text/LaTeX annotations, which dominate the cost of a low resolution
+render. It is chosen with the RENDER_PROFILE environment variable, or
+`render_all.py --profile`, which sets it for its manim processes:
+
+    RENDER_PROFILE=draft manim scenes.py SeriesPipesScene   # layout check in seconds
+    python render_all.py --profile final
+
+Without a profile, each folder's manim.cfg (and manim's -q/-r flags) apply.
+
+Scenes that draw random numbers call seed_scene(self) first, so every render
+of the scene, and every segment of a segmented render, sees the same values.
+"""
+import os
+import random
+import zlib
+from collections import namedtuple
+
+import numpy as np
+
+ENV_VAR = 'RENDER_PROFILE'
+
+RenderProfile = namedtuple('RenderProfile', ['name', 'pixel_width', 'pixel_height', 'frame_rate', 'annotations'])
+
+PROFILES = {
+    'draft': RenderProfile('draft', 854, 480, 15, False),
+    'preview': RenderProfile('preview', 1280, 720, 30, True),
+    'final': RenderProfile('final', 3840, 2160, 60, True),
+}
+
+
+def apply_profile(config):
+    """
+    Applies the selected render profile to manim's config.
+
+    Call it at import time of a scenes.py, after `from manim import *`.
+
+    Args:
+        config: manim's global config object.
+
+    Returns:
+        RenderProfile: The applied profile. Without one, a profile named
+            'manim.cfg' that mirrors the current config with annotations on.
+
+    Raises:
+        ValueError: If the profile name is unknown.
+    """
+    name = os.environ.get(ENV_VAR, '').strip().lower()
+    if not name:
+        return RenderProfile('manim.cfg', config.pixel_width, config.pixel_height, config.frame_rate, True)
+    if name not in PROFILES:
+        raise ValueError(f"Unknown render profile '{name}'; choose from {', '.join(PROFILES)}")
+
+    profile = PROFILES[name]
+    config.pixel_width = profile.pixel_width
+    config.pixel_height = profile.pixel_height
+    config.frame_rate = profile.frame_rate
+    return profile
+
+
+def seed_scene(scene):
+    """
+    Seeds `random` and `numpy.random` from the scene's class name.
+
+    Call it at the start of construct(). The seed is stable across runs and
+    processes (unlike hash()), so renders are reproducible and render_all.py
+    segments continue the same particle layout across their boundaries.
+
+    Returns:
+        int: The seed.
+    """
+    seed = zlib.crc32(type(scene).__name__.encode())
+    random.seed(seed)
+    np.random.seed(seed)
+    return seed
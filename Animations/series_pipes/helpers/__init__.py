@@ -1,5 +1,9 @@
-"""Parallel Pipes Helpers Package."""
+"""Series Pipes Helpers Package."""
+from hydraulics.cache import ConfigCache
+from hydraulics.pipes import calculate_velocity
+from hydraulics.series_parallel import calculate_parallel_flows, calculate_system_heads
+from hydraulics.transients import simulate_valve_closure
+
 from .utils import load_config
 from .geometry import create_system_mobjects
-from .physics import calculate_parallel_flows, calculate_velocity
 from .annotations import create_flow_label
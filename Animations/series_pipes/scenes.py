@@ -8,22 +8,29 @@ import random
 import sys
 import os
 
-# Add helpers to path
+# Import helpers/ from this folder and the shared hydraulics package and
+# render_profiles from the Animations folder above it
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from helpers.utils import load_config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from helpers.geometry import create_system_mobjects
-from helpers.physics import calculate_parallel_flows, calculate_system_heads
+from helpers import ConfigCache, calculate_system_heads
 from helpers.annotations import create_flow_label, create_head_label, create_flow_arrow
+from render_profiles import apply_profile, seed_scene
 
 # Load configuration
 script_dir = os.path.dirname(os.path.abspath(__file__))
-INPUTS = load_config(os.path.join(script_dir, 'inputs.yaml'))
+CACHE = ConfigCache(os.path.join(script_dir, 'inputs.yaml'), required=('network', 'display', 'physics'))
+INPUTS = CACHE.config
+PROFILE = apply_profile(config)
 
 
 class SeriesPipesScene(Scene):
     """Main scene demonstrating flow through pipes in series."""
     
     def construct(self):
+        # Same particle offsets in every render (see render_profiles.seed_scene)
+        seed_scene(self)
+
         # Load configuration
         nodes_cfg = INPUTS['network']['nodes']
         pipes_cfg = INPUTS['network']['pipes']
@@ -86,23 +93,25 @@ class SeriesPipesScene(Scene):
         
         # 2. Calculate Heads and Velocities
         combined_phys = {**INPUTS['physics']['fluid'], **INPUTS['physics']}
-        node_heads, pipe_velocities = calculate_system_heads(nodes_cfg, pipes_cfg, flows, combined_phys)
+        node_heads, pipe_velocities = CACHE.get('heads', calculate_system_heads, nodes_cfg, pipes_cfg, flows, combined_phys)
         
         # Create Flow Labels (Q is constant, maybe just one label? or one per pipe to show equality)
         annotations_labels = VGroup()
         
-        # Place labels
-        # Inlet
-        flow_lbl_inlet = create_flow_label(pipes['pipe_inlet'][1], flows['inlet'], "inlet", direction=UP, buff=1.2)
+        # Flow labels are MathTex; draft renders skip building them
+        if PROFILE.annotations:
+            # Place labels
+            # Inlet
+            flow_lbl_inlet = create_flow_label(pipes['pipe_inlet'][1], flows['inlet'], "inlet", direction=UP, buff=1.2)
         
-        # Pipe A
-        flow_lbl_A = create_flow_label(pipes['pipe_A'][1], flows['A'], "A", direction=UP, buff=0.9)
+            # Pipe A
+            flow_lbl_A = create_flow_label(pipes['pipe_A'][1], flows['A'], "A", direction=UP, buff=0.9)
 
-        # Outlet
-        flow_lbl_outlet = create_flow_label(pipes['pipe_outlet'][1], flows['outlet'], "outlet", direction=UP, buff=1.2)
+            # Outlet
+            flow_lbl_outlet = create_flow_label(pipes['pipe_outlet'][1], flows['outlet'], "outlet", direction=UP, buff=1.2)
 
-        flow_lbls = VGroup(flow_lbl_inlet, flow_lbl_A, flow_lbl_outlet)
-        self.play(Create(flow_lbls), run_time=0.5)
+            flow_lbls = VGroup(flow_lbl_inlet, flow_lbl_A, flow_lbl_outlet)
+            self.play(Create(flow_lbls), run_time=0.5)
 
 
         
@@ -0,0 +1,292 @@
+"""
+Benchmarks for WaterNetwork on synthetic grid networks.
+
+Usage:
+    python benchmarks.py pressures --nodes 500000
+    python benchmarks.py hardy-cross --sides 10 20 --anderson 5
+    python benchmarks.py scenarios --side 50 --scenarios 200 --workers 4
+    python benchmarks.py resolve --side 300 --tol 1e-6
+    python benchmarks.py load --side 224 --yaml-side 70
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import yaml
+
+# Import helpers/ from this folder and the shared hydraulics package and
+# render_profiles from the Animations folder above it
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from helpers.network_io import load_network, save_network
+from helpers.physics import WaterNetwork
+
+
+def grid_network(rows, cols, seed=0, demand=0.001):
+    """
+    Builds a rows x cols grid network with pipes between horizontal and
+    vertical neighbors, random lengths/diameters and a uniform demand drawn
+    from node 0.
+
+    Returns:
+        WaterNetwork: Node ids are r * cols + c; node 0 is the source.
+    """
+    rng = np.random.default_rng(seed)
+    ids = np.arange(rows * cols)
+    net = WaterNetwork()
+    net.add_nodes(ids, ids % cols * 100.0, ids // cols * 100.0, elevation=0, demand=demand)
+    net.demands[0] = -demand * (rows * cols - 1)
+
+    grid = ids.reshape(rows, cols)
+    starts = np.concatenate([grid[:, :-1].ravel(), grid[:-1, :].ravel()])
+    ends = np.concatenate([grid[:, 1:].ravel(), grid[1:, :].ravel()])
+    n_pipes = len(starts)
+    net.add_pipes(starts, ends, rng.uniform(50, 300, n_pipes), rng.choice([0.1, 0.15, 0.2, 0.3], n_pipes))
+    return net
+
+
+def initial_tree_flows(net, source_id=0):
+    """Continuity-satisfying starting flows routed along the spanning tree."""
+    order, parent, parent_pipe, direction = net.spanning_tree(source_id)
+    carried = net.demands.copy()
+    flows = np.zeros(len(net.pipes))
+    for v in order[:0:-1]:
+        flows[parent_pipe[v]] = direction[v] * carried[v]
+        carried[parent[v]] += carried[v]
+    net.flows[:] = flows
+    net.invalidate_adjacency(directed_only=True)
+
+
+def legacy_calculate_pressures(net, source_node_id, source_head):
+    """The original list-queue BFS (queue.pop(0), dict adjacency per call)."""
+    net.nodes[source_node_id].head = source_head
+    visited = set([source_node_id])
+    queue = [source_node_id]
+    adj = {n: [] for n in net.nodes}
+    for p in net.pipes:
+        adj[p.start_node].append((p.end_node, p, 1))
+        adj[p.end_node].append((p.start_node, p, -1))
+
+    while queue:
+        u_id = queue.pop(0)
+        u = net.nodes[u_id]
+        for v_id, pipe, direction in adj[u_id]:
+            if v_id not in visited:
+                if direction == 1:
+                    net.nodes[v_id].head = u.head - pipe.head_loss
+                else:
+                    net.nodes[v_id].head = u.head + pipe.head_loss
+                visited.add(v_id)
+                queue.append(v_id)
+
+    for n in net.nodes.values():
+        n.pressure = 9.81 * (n.head - n.elevation)
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def bench_pressures(args):
+    for n_nodes, legacy in ((args.legacy_nodes, True), (args.nodes, False)):
+        side = int(np.sqrt(n_nodes))
+        net = grid_network(side, side)
+        # Head losses derived from a known head field, so any spanning tree reproduces it
+        target = 100.0 - np.random.default_rng(1).uniform(0, 20, len(net.node_ids))
+        target[0] = 100.0
+        net.head_losses[:] = target[net.start_index] - target[net.end_index]
+
+        cold = _timed(net.calculate_pressures, 0, 100.0)
+        warm = _timed(net.calculate_pressures, 0, 100.0)
+        assert np.allclose(net.heads, target)
+        print(f"{side * side:>9} nodes  calculate_pressures  cold {cold:8.3f}s  warm {warm:8.3f}s")
+
+        if legacy:
+            net.heads[:] = 0
+            elapsed = _timed(legacy_calculate_pressures, net, 0, 100.0)
+            assert np.allclose(net.heads, target)
+            print(f"{side * side:>9} nodes  legacy BFS                {elapsed:8.3f}s")
+
+
+def bench_hardy_cross(args):
+    for side in args.sides:
+        reference = grid_network(side, side)
+        reference.solve_global_newton({0: 100.0})
+        for anderson in (0, args.anderson):
+            net = grid_network(side, side)
+            initial_tree_flows(net)
+            net.detect_loops()
+            start = time.perf_counter()
+            sweeps = net.solve_hardy_cross(max_iter=args.max_iter, tol=args.tol, anderson=anderson)
+            elapsed = time.perf_counter() - start
+            error = np.abs(net.flows - reference.flows).max()
+            print(f"{side}x{side} grid  anderson={anderson}  sweeps {sweeps:5d}  {elapsed:7.2f}s  "
+                  f"max |Q - Q_newton| {error:.1e}")
+
+
+def bench_scenarios(args):
+    net = grid_network(args.side, args.side)
+    rng = np.random.default_rng(2)
+    demands = net.demands * rng.uniform(0.5, 1.5, (args.scenarios, 1))
+    demands[:, 0] = -demands[:, 1:].sum(axis=1)
+
+    start = time.perf_counter()
+    for row in demands[:args.loop_scenarios]:
+        single = grid_network(args.side, args.side)
+        single.demands[:] = row
+        single.solve_global_newton({0: 100.0})
+    per_scenario = (time.perf_counter() - start) / args.loop_scenarios
+    print(f"{args.side}x{args.side} grid  one network per scenario  {per_scenario * 1e3:8.2f} ms/scenario")
+
+    for workers in (None, args.workers):
+        start = time.perf_counter()
+        flows, heads, pressures = net.solve_scenarios(demands, {0: 100.0}, workers=workers)
+        per_scenario = (time.perf_counter() - start) / args.scenarios
+        print(f"{args.side}x{args.side} grid  solve_scenarios workers={workers}  {per_scenario * 1e3:8.2f} ms/scenario")
+    assert np.allclose(flows[args.loop_scenarios - 1], single.flows)
+
+
+def bench_resolve(args):
+    edited_pipe = len(grid_network(args.side, args.side).pipes) // 2
+    edited_node = args.side * args.side // 3
+
+    net = grid_network(args.side, args.side, demand=args.node_demand)
+    net.solve_global_newton({0: 100.0})
+    net.detect_loops()
+    net.calculate_pressures(0, 100.0)
+    # Builds the cached loop/tree structures, as after a scene's first solve
+    net.resolve(0)
+    net.pipes[edited_pipe].diameter *= args.scale
+    net.nodes[edited_node].demand += args.demand
+    net.nodes[0].demand -= args.demand
+    # Count fallbacks to the full solve, to show whether the edit stayed local
+    fallbacks = []
+    full_solve = net.solve_global_newton
+    net.solve_global_newton = lambda *a: fallbacks.append(1) or full_solve(*a)
+    start = time.perf_counter()
+    steps = net.resolve(0, tol=args.tol, head_tol=args.head_tol, max_loops=args.max_loops)
+    incremental = time.perf_counter() - start
+
+    reference = grid_network(args.side, args.side, demand=args.node_demand)
+    reference.diameters[edited_pipe] *= args.scale
+    reference.invalidate_geometry()
+    reference.demands[edited_node] += args.demand
+    reference.demands[0] -= args.demand
+    start = time.perf_counter()
+    reference.solve_global_newton({0: 100.0})
+    reference.calculate_pressures(0, 100.0)
+    full = time.perf_counter() - start
+
+    path = "full fallback" if fallbacks else "local"
+    print(f"{args.side}x{args.side} grid  resolve {incremental:7.3f}s ({steps} steps, {path})  full re-solve {full:7.3f}s  "
+          f"max |Q - Q_full| {np.abs(net.flows - reference.flows).max():.1e}  "
+          f"max |H - H_full| {np.abs(net.heads - reference.heads).max():.1e}")
+
+
+def write_yaml(net, path):
+    """Writes the network in the inputs.yaml layout the scene reads."""
+    network = {
+        'nodes': {f"node_{nid}": {'id': int(nid), 'pos': [float(x), float(y), 0], 'elevation': float(z), 'demand': float(d)}
+                  for nid, (x, y, _), z, d in zip(net.node_ids, net.positions, net.elevations, net.demands)},
+        'pipes': {f"p{i}": {'id': i, 'start': int(net.node_ids[s]), 'end': int(net.node_ids[e]),
+                            'length': float(l), 'diameter': float(d)}
+                  for i, (s, e, l, d) in enumerate(zip(net.start_index, net.end_index, net.lengths, net.diameters))},
+    }
+    with open(path, 'w') as f:
+        yaml.safe_dump({'network': network}, f)
+
+
+def load_yaml(path):
+    """Uncached YAML baseline: yaml.safe_load, then one add_node/add_pipe per entry."""
+    # Parse directly: load_config would hit inputs.yaml.cache and skip the parse being measured
+    with open(path) as f:
+        config = yaml.safe_load(f)['network']
+    net = WaterNetwork()
+    for node in config['nodes'].values():
+        net.add_node(node['id'], node['pos'][0], node['pos'][1], node['elevation'], node['demand'])
+    for pipe in sorted(config['pipes'].values(), key=lambda p: p['id']):
+        net.add_pipe(pipe['start'], pipe['end'], pipe['length'], pipe['diameter'])
+    return net
+
+
+def write_inp(net, path, source_head):
+    """Writes an EPANET .inp file (LPS, mm) with node 0 as a reservoir."""
+    ids = net.node_ids
+    with open(path, 'w') as f:
+        f.write("[JUNCTIONS]\n;ID Elev Demand\n")
+        f.writelines(f"{ids[i]} {net.elevations[i]} {net.demands[i] * 1e3}\n" for i in range(1, len(ids)))
+        f.write(f"\n[RESERVOIRS]\n{ids[0]} {source_head}\n\n[PIPES]\n;ID Node1 Node2 Length Diameter Roughness MinorLoss Status\n")
+        f.writelines(f"P{i} {ids[s]} {ids[e]} {l} {d * 1e3} {c} 0 Open\n" for i, (s, e, l, d, c) in
+                     enumerate(zip(net.start_index, net.end_index, net.lengths, net.diameters, net.c_factors)))
+        f.write("\n[COORDINATES]\n")
+        f.writelines(f"{nid} {x} {y}\n" for nid, (x, y, _) in zip(ids, net.positions))
+        f.write("\n[OPTIONS]\nUnits LPS\nHeadloss H-W\n\n[END]\n")
+
+
+def bench_load(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        small = grid_network(args.yaml_side, args.yaml_side)
+        write_yaml(small, os.path.join(tmp, 'network.yaml'))
+        elapsed = _timed(load_yaml, os.path.join(tmp, 'network.yaml'))
+        print(f"{len(small.pipes):>7} pipes  inputs.yaml + add_node/add_pipe  {elapsed:7.2f}s")
+
+        net = grid_network(args.side, args.side)
+        net.elevations[1:] = 0.0
+        write_inp(net, os.path.join(tmp, 'network.inp'), 100.0)
+        save_network(net, os.path.join(tmp, 'network.npz'), {0: 100.0})
+        for name in ('network.inp', 'network.npz'):
+            start = time.perf_counter()
+            loaded, fixed_heads = load_network(os.path.join(tmp, name))
+            elapsed = time.perf_counter() - start
+            order = [loaded.node_index(nid) for nid in net.node_ids]
+            assert fixed_heads == {0: 100.0}
+            assert np.allclose(loaded.demands[order[1:]], net.demands[1:]) and np.allclose(loaded.diameters, net.diameters)
+            print(f"{len(loaded.pipes):>7} pipes  load_network({name})  {elapsed:7.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("pressures", help="calculate_pressures vs. the original list-queue BFS")
+    p.add_argument("--nodes", type=int, default=500_000)
+    p.add_argument("--legacy-nodes", type=int, default=40_000, help="legacy BFS is quadratic; keep this small")
+    p.set_defaults(func=bench_pressures)
+
+    p = sub.add_parser("hardy-cross", help="Hardy Cross sweeps with and without Anderson mixing")
+    p.add_argument("--sides", type=int, nargs="+", default=[10, 20])
+    p.add_argument("--anderson", type=int, default=5, help="Anderson memory")
+    p.add_argument("--tol", type=float, default=1e-8)
+    p.add_argument("--max-iter", type=int, default=5000)
+    p.set_defaults(func=bench_hardy_cross)
+
+    p = sub.add_parser("scenarios", help="solve_scenarios vs. one network and solve per scenario")
+    p.add_argument("--side", type=int, default=50)
+    p.add_argument("--scenarios", type=int, default=200)
+    p.add_argument("--loop-scenarios", type=int, default=20, help="scenarios timed with the per-network loop")
+    p.add_argument("--workers", type=int, default=4)
+    p.set_defaults(func=bench_scenarios)
+
+    p = sub.add_parser("resolve", help="incremental resolve after one pipe and one demand edit vs. a full solve")
+    p.add_argument("--side", type=int, default=300)
+    p.add_argument("--tol", type=float, default=1e-6)
+    p.add_argument("--head-tol", type=float, default=1e-3)
+    p.add_argument("--max-loops", type=int, default=20000, help="loop budget before resolve falls back to a full solve")
+    p.add_argument("--scale", type=float, default=0.5, help="factor applied to the edited pipe's diameter")
+    p.add_argument("--demand", type=float, default=1e-4, help="demand moved from the source to the edited node")
+    p.add_argument("--node-demand", type=float, default=2e-6, help="base demand per grid node (m3/s)")
+    p.set_defaults(func=bench_resolve)
+
+    p = sub.add_parser("load", help="load_network (.inp/.npz) vs. inputs.yaml with per-element adds")
+    p.add_argument("--side", type=int, default=224, help="grid side for .inp/.npz (224 -> 100k pipes)")
+    p.add_argument("--yaml-side", type=int, default=70, help="grid side for the YAML path")
+    p.set_defaults(func=bench_load)
+
+    args = parser.parse_args()
+    args.func(args)
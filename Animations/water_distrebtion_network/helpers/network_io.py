@@ -0,0 +1,235 @@
+"""
+Columnar network files for large WaterNetwork models.
+
+Three formats load straight into the node/pipe arrays with one
+add_nodes/add_pipes call each:
+
+- `.inp`: EPANET input file. [JUNCTIONS], [RESERVOIRS], [TANKS], [PIPES],
+  [DEMANDS], [COORDINATES] and [OPTIONS] (Units, Headloss) are read line by
+  line; pumps, valves, patterns and controls are ignored and CLOSED pipes
+  are skipped. Values are converted to SI (m, m^3/s).
+- `.csv`: a nodes file (id, x, y, elevation, demand[, head]) and a pipes file
+  (start, end, length, diameter[, c][, roughness]) with header rows.
+- `.npz`: the same columns as arrays, written by save_network.
+
+A node with a head (reservoir, tank, or a non-empty `head` column) is a
+fixed-head node; load_network returns those heads for the solvers.
+"""
+import csv
+import os
+
+import numpy as np
+
+from .physics import WaterNetwork
+
+# EPANET flow units -> m^3/s
+FLOW_UNITS = {
+    'LPS': 1e-3, 'LPM': 1e-3 / 60, 'MLD': 1e3 / 86400, 'CMH': 1 / 3600, 'CMD': 1 / 86400,
+    'CFS': 0.0283168, 'GPM': 6.30902e-5, 'MGD': 0.0438126, 'IMGD': 0.0526168, 'AFD': 0.0142764,
+}
+US_UNITS = {'CFS', 'GPM', 'MGD', 'IMGD', 'AFD'}
+FT = 0.3048
+INCH = 0.0254
+
+NODE_COLUMNS = ('id', 'x', 'y', 'elevation', 'demand', 'head')
+PIPE_COLUMNS = ('start', 'end', 'length', 'diameter', 'c', 'roughness')
+
+
+def _node_ids(values):
+    """Integer ids when every id is an integer literal, strings otherwise."""
+    try:
+        return [int(v) for v in values]
+    except ValueError:
+        return list(values)
+
+
+def _build(columns, friction, viscosity):
+    """Creates the network from node/pipe column dicts; returns (network, fixed_heads)."""
+    net = WaterNetwork(friction=friction, viscosity=viscosity)
+    ids = columns['id']
+    net.add_nodes(ids, columns['x'], columns['y'], columns['elevation'], columns['demand'])
+    head = np.asarray(columns['head'], dtype=float)
+    fixed = np.flatnonzero(~np.isnan(head))
+    fixed_heads = {ids[i]: float(head[i]) for i in fixed}
+
+    net.add_pipes(
+        columns['start'], columns['end'], columns['length'], columns['diameter'],
+        columns['c'], columns['roughness']
+    )
+    return net, fixed_heads
+
+
+def _read_inp(path):
+    """Streams an EPANET .inp file into SI node/pipe columns and its friction model."""
+    junctions, reservoirs, tanks, pipes, coords, demands = [], [], [], [], {}, {}
+    options = {'UNITS': 'GPM', 'HEADLOSS': 'H-W'}
+    section = None
+    with open(path) as f:
+        for line in f:
+            fields = line.split(';', 1)[0].split()
+            if not fields:
+                continue
+            if fields[0].startswith('['):
+                section = fields[0].upper()
+            elif section == '[JUNCTIONS]':
+                junctions.append(fields)
+            elif section == '[RESERVOIRS]':
+                reservoirs.append(fields)
+            elif section == '[TANKS]':
+                tanks.append(fields)
+            elif section == '[PIPES]':
+                if len(fields) < 8 or fields[7].upper() != 'CLOSED':
+                    pipes.append(fields)
+            elif section == '[COORDINATES]':
+                coords[fields[0]] = (float(fields[1]), float(fields[2]))
+            elif section == '[DEMANDS]':
+                demands[fields[0]] = demands.get(fields[0], 0.0) + float(fields[1])
+            elif section == '[OPTIONS]' and len(fields) > 1 and fields[0].upper() in options:
+                options[fields[0].upper()] = fields[1].upper()
+
+    units = options['UNITS']
+    if units not in FLOW_UNITS:
+        raise ValueError(f"Unsupported flow units in {path}: {units}")
+    headloss = {'H-W': 'hazen-williams', 'D-W': 'darcy-weisbach'}.get(options['HEADLOSS'])
+    if headloss is None:
+        raise ValueError(f"Unsupported headloss formula in {path}: {options['HEADLOSS']}")
+    us = units in US_UNITS
+    length_scale = FT if us else 1.0
+    diameter_scale = INCH if us else 1e-3
+
+    ids = [j[0] for j in junctions] + [r[0] for r in reservoirs] + [t[0] for t in tanks]
+    n_junctions = len(junctions)
+    elevation = np.zeros(len(ids))
+    demand = np.zeros(len(ids))
+    head = np.full(len(ids), np.nan)
+    elevation[:n_junctions] = [float(j[1]) for j in junctions]
+    demand[:n_junctions] = [float(j[2]) if len(j) > 2 else 0.0 for j in junctions]
+    for i, nid in enumerate(ids[:n_junctions]):
+        if nid in demands:
+            demand[i] = demands[nid]
+    # Reservoirs: ID Head; tanks: ID Elevation InitLevel ...
+    n_fixed = n_junctions + len(reservoirs)
+    head[n_junctions:n_fixed] = [float(r[1]) for r in reservoirs]
+    elevation[n_junctions:n_fixed] = head[n_junctions:n_fixed]
+    elevation[n_fixed:] = [float(t[1]) for t in tanks]
+    head[n_fixed:] = elevation[n_fixed:] + [float(t[2]) for t in tanks]
+
+    xy = np.array([coords.get(nid, (0.0, 0.0)) for nid in ids]).reshape(len(ids), 2)
+    roughness = np.array([float(p[5]) for p in pipes])
+    hazen_williams = headloss == 'hazen-williams'
+    # Ids and pipe end points convert together so they stay the same type
+    labels = _node_ids(ids + [p[1] for p in pipes] + [p[2] for p in pipes])
+    n_nodes, n_pipes = len(ids), len(pipes)
+    columns = {
+        'id': labels[:n_nodes], 'x': xy[:, 0], 'y': xy[:, 1],
+        'elevation': elevation * length_scale, 'demand': demand * FLOW_UNITS[units], 'head': head * length_scale,
+        'start': labels[n_nodes:n_nodes + n_pipes], 'end': labels[n_nodes + n_pipes:],
+        'length': np.array([float(p[3]) for p in pipes]) * length_scale,
+        'diameter': np.array([float(p[4]) for p in pipes]) * diameter_scale,
+        'c': roughness if hazen_williams else 130,
+        # D-W roughness is given in millifeet (US) or mm (SI)
+        'roughness': 1.5e-6 if hazen_williams else roughness * (1e-3 * FT if us else 1e-3),
+    }
+    return columns, headloss
+
+
+def _read_csv(path, names, required):
+    """Streams a CSV file with a header row into {column: list of strings}."""
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = [h.strip() for h in next(reader)]
+        missing = [c for c in required if c not in header]
+        if missing:
+            raise ValueError(f"{path} is missing columns: {', '.join(missing)}")
+        picked = [(c, header.index(c)) for c in names if c in header]
+        columns = {c: [] for c, _ in picked}
+        for row in reader:
+            if row:
+                for c, i in picked:
+                    columns[c].append(row[i])
+    return columns
+
+
+def _float_column(values, default):
+    """Floats from CSV strings; empty cells take `default`."""
+    return np.array([float(v) if v.strip() else default for v in values], dtype=float)
+
+
+def load_network(path, pipes_path=None, friction=None, viscosity=1.0e-6):
+    """
+    Loads a network from an .inp, .npz or pair of .csv files.
+
+    Args:
+        path (str): .inp or .npz file, or the nodes .csv file.
+        pipes_path (str): Pipes .csv file (required for CSV input).
+        friction (str): Friction model; defaults to the .inp Headloss option,
+            'hazen-williams' otherwise.
+        viscosity (float): Kinematic viscosity (m^2/s) for Darcy-Weisbach.
+
+    Returns:
+        tuple: (WaterNetwork, fixed_heads) where fixed_heads maps node ids to
+            their fixed head (m), ready for solve_global_newton.
+
+    Raises:
+        FileNotFoundError: If an input file does not exist.
+        ValueError: If the format, units or columns are not supported.
+    """
+    for p in (path, pipes_path):
+        if p is not None and not os.path.exists(p):
+            raise FileNotFoundError(f"Network file not found: {os.path.abspath(p)}")
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext == '.inp':
+        columns, file_friction = _read_inp(path)
+        return _build(columns, friction or file_friction, viscosity)
+
+    if ext == '.npz':
+        with np.load(path, allow_pickle=False) as data:
+            columns = {name: data[name] for name in data.files}
+        columns['id'] = columns['id'].tolist()
+        columns['start'] = columns['start'].tolist()
+        columns['end'] = columns['end'].tolist()
+        return _build(columns, friction or 'hazen-williams', viscosity)
+
+    if ext == '.csv':
+        if pipes_path is None:
+            raise ValueError("CSV input needs both a nodes file and a pipes file")
+        nodes = _read_csv(path, NODE_COLUMNS, ('id', 'x', 'y'))
+        pipes = _read_csv(pipes_path, PIPE_COLUMNS, ('start', 'end', 'length', 'diameter'))
+        n_nodes = len(nodes['id'])
+        n_pipes = len(pipes['start'])
+        columns = {
+            'id': _node_ids(nodes['id']),
+            'x': _float_column(nodes['x'], 0.0), 'y': _float_column(nodes['y'], 0.0),
+            'elevation': _float_column(nodes.get('elevation', [''] * n_nodes), 0.0),
+            'demand': _float_column(nodes.get('demand', [''] * n_nodes), 0.0),
+            'head': _float_column(nodes.get('head', [''] * n_nodes), np.nan),
+            'start': _node_ids(pipes['start']), 'end': _node_ids(pipes['end']),
+            'length': _float_column(pipes['length'], 0.0), 'diameter': _float_column(pipes['diameter'], 0.0),
+            'c': _float_column(pipes.get('c', [''] * n_pipes), 130.0),
+            'roughness': _float_column(pipes.get('roughness', [''] * n_pipes), 1.5e-6),
+        }
+        return _build(columns, friction or 'hazen-williams', viscosity)
+
+    raise ValueError(f"Unsupported network file type: {ext}")
+
+
+def save_network(net, path, fixed_heads=None):
+    """
+    Writes a network's node and pipe columns to an .npz file for load_network.
+
+    Args:
+        net (WaterNetwork): Network to save.
+        path (str): Output .npz path.
+        fixed_heads (dict): Optional {node id: head} stored in the `head` column.
+    """
+    head = np.full(len(net.node_ids), np.nan)
+    for nid, value in (fixed_heads or {}).items():
+        head[net.node_index(nid)] = value
+    ids = np.asarray(net.node_ids)
+    np.savez(
+        path, id=ids, x=net.positions[:, 0], y=net.positions[:, 1],
+        elevation=net.elevations, demand=net.demands, head=head,
+        start=ids[net.start_index], end=ids[net.end_index],
+        length=net.lengths, diameter=net.diameters, c=net.c_factors, roughness=net.roughness
+    )
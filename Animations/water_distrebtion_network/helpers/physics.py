@@ -1,120 +1,1186 @@
+import os
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import breadth_first_order, depth_first_order
+from scipy.sparse.linalg import splu, spsolve
+
+from hydraulics.acceleration import AndersonAccelerator
+from hydraulics.friction import darcy_weisbach_resistance, friction_factor, friction_factor_slope, reynolds
+from hydraulics.loops import fundamental_loops
+
+# Outcome of solve_global_newton: max-abs residual at the start of each
+# iteration, Newton steps taken and whether the residual fell below tol
+NewtonResult = namedtuple('NewtonResult', ['residuals', 'iterations', 'converged'])
+
+
+def hazen_williams_resistance(lengths, diameters, c):
+    """
+    Hazen-Williams resistance coefficient k = 10.67 * L / (C^1.852 * D^4.87),
+    so that hf = k * |Q|^1.852 * sign(Q). Accepts scalars or arrays.
+    """
+    return 10.67 * np.asarray(lengths) / (np.asarray(c) ** 1.852 * np.asarray(diameters) ** 4.87)
+
+
+def power_law_head_loss(flows, resistance, exponent):
+    """Signed head loss k * |Q|^n * sign(Q) for arrays of flows (m^3/s) and resistances."""
+    q = np.asarray(flows, dtype=float)
+    loss = resistance * np.abs(q)**exponent * np.sign(q)
+    return np.where(np.abs(q) < 1e-9, 0.0, loss)
+
+
+def hazen_williams_head_loss(flows, resistance):
+    """Signed Hazen-Williams head loss for arrays of flows (m^3/s) and resistances."""
+    return power_law_head_loss(flows, resistance, 1.852)
+
+
+def pipe_velocity(flows, diameters):
+    """Mean velocity Q / A for arrays of flows and diameters; zero where D <= 0."""
+    q = np.asarray(flows, dtype=float)
+    area = np.pi * (np.asarray(diameters, dtype=float) / 2)**2
+    return np.divide(q, area, out=np.zeros(np.broadcast(q, area).shape), where=area > 0)
+
+
+def _build_csr(n_rows, rows, *columns):
+    """
+    Groups parallel entry arrays by row. Returns (indptr, *columns) sorted
+    so that row i's entries live in columns[j][indptr[i]:indptr[i+1]].
+    """
+    order = np.argsort(rows, kind='stable')
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+    return (indptr,) + tuple(col[order] for col in columns)
+
+
+def _accumulate_to_root(parent, delta):
+    """
+    Sums delta along every node's path to its tree root by pointer jumping:
+    O(n log depth) work in a handful of vectorized passes. Roots and
+    unreached nodes have parent -1.
+    """
+    acc = delta.copy()
+    anc = parent.copy()
+    active = np.flatnonzero(anc >= 0)
+    while active.size:
+        a = anc[active]
+        acc[active] += acc[a]
+        anc[active] = anc[a]
+        active = active[anc[active] >= 0]
+    return acc
+
+
+class _HazenWilliams:
+    """Hazen-Williams head loss hf = k |Q|^1.852 sign(Q); k is flow independent."""
+    exponent = 1.852
+
+    def __init__(self, network):
+        self.k = hazen_williams_resistance(network.lengths, network.diameters, network.c_factors)
+
+    def refresh(self, network, pipes):
+        self.k[pipes] = hazen_williams_resistance(
+            network.lengths[pipes], network.diameters[pipes], network.c_factors[pipes]
+        )
+
+    def resistance(self, flows, pipes=slice(None)):
+        return self.k[pipes]
+
+    def gradient(self, flows, k, pipes=slice(None)):
+        """dhf/dQ = 1.852 k |Q|^0.852; the floor keeps it invertible at zero flow."""
+        return self.exponent * k * np.maximum(np.abs(flows), 1e-6)**(self.exponent - 1)
+
+
+class _DarcyWeisbach:
+    """
+    Darcy-Weisbach head loss hf = k(Q) Q|Q| with k = 8 f L / (g pi^2 D^5).
+    Friction factors come from Colebrook (64/Re when laminar), warm-started
+    from the previous evaluation over the same pipes.
+    """
+    exponent = 2.0
+
+    def __init__(self, network):
+        self.viscosity = network.viscosity
+        self.friction_factors = None
+        self.refresh(network, slice(None))
+
+    def refresh(self, network, pipes):
+        if isinstance(pipes, slice):
+            self.diameters = network.diameters.copy()
+            self.roughness = network.roughness.copy()
+            self.scale = darcy_weisbach_resistance(network.lengths, self.diameters, 1.0)
+            return
+        self.diameters[pipes] = network.diameters[pipes]
+        self.roughness[pipes] = network.roughness[pipes]
+        self.scale[pipes] = darcy_weisbach_resistance(network.lengths[pipes], self.diameters[pipes], 1.0)
+
+    def resistance(self, flows, pipes=slice(None)):
+        d = self.diameters[pipes]
+        # Floor keeps f (and k) finite at zero flow, where laminar 64/Re applies
+        q = np.maximum(np.abs(flows), 1e-9)
+        re = reynolds(pipe_velocity(q, d), d, self.viscosity)
+        full = isinstance(pipes, slice)
+        f0 = self.friction_factors if full and self.friction_factors is not None \
+            and self.friction_factors.shape == re.shape else None
+        f = friction_factor(re, self.roughness[pipes], d, method='colebrook', f0=f0, transitional=True)
+        if full:
+            self.friction_factors = f
+        return self.scale[pipes] * f
+
+    def gradient(self, flows, k, pipes=slice(None)):
+        """
+        dhf/dQ = k |Q| (2 + d ln f / d ln Re) for k = resistance(flows, pipes).
+        Including the change of f with flow keeps Newton quadratic.
+        """
+        d = self.diameters[pipes]
+        q = np.maximum(np.abs(flows), 1e-9)
+        re = reynolds(pipe_velocity(q, d), d, self.viscosity)
+        slope = friction_factor_slope(re, self.roughness[pipes], d, k / self.scale[pipes], transitional=True)
+        # Floor keeps the derivative invertible for (near) zero flows
+        return k * np.maximum(q, 1e-6) * (2 + slope)
+
+
+class _Table:
+    """
+    Growable structure-of-arrays storage. Each column is a NumPy array
+    with spare capacity; only the first `size` rows are live.
+    """
+    def __init__(self, columns):
+        # columns: {name: (dtype, trailing_shape)}
+        self.size = 0
+        self.columns = {
+            name: np.zeros((0,) + shape, dtype=dtype) for name, (dtype, shape) in columns.items()
+        }
+
+    def _reserve(self, n):
+        capacity = len(next(iter(self.columns.values())))
+        if self.size + n <= capacity:
+            return
+        new_capacity = max(self.size + n, 2 * capacity, 16)
+        for name, col in self.columns.items():
+            grown = np.zeros((new_capacity,) + col.shape[1:], dtype=col.dtype)
+            grown[:self.size] = col[:self.size]
+            self.columns[name] = grown
+
+    def extend(self, n, **values):
+        """Appends n rows; missing columns stay zero. Returns the new row slice."""
+        self._reserve(n)
+        rows = slice(self.size, self.size + n)
+        for name, val in values.items():
+            self.columns[name][rows] = val
+        self.size += n
+        return rows
+
+    def __getitem__(self, name):
+        return self.columns[name][:self.size]
+
 
 class Pipe:
-    def __init__(self, start_node, end_node, length, diameter, roughness_c=100):
-        self.start_node = start_node
-        self.end_node = end_node
-        self.length = length  # m
-        self.diameter = diameter  # m
-        self.c = roughness_c
-        self.flow_rate = 0.0  # m^3/s, initial guess
-        self.velocity = 0.0
-        self.head_loss = 0.0
+    """View onto one row of a WaterNetwork's pipe arrays."""
+    __slots__ = ('_net', 'index')
+
+    def __init__(self, network, index):
+        self._net = network
+        self.index = index
+
+    def _get(self, name):
+        return self._net._pipe_table.columns[name][self.index]
+
+    def _set(self, name, value):
+        self._net._pipe_table.columns[name][self.index] = value
+
+    @property
+    def start_node(self):
+        return self._net.node_ids[self._get('start')]
+
+    @property
+    def end_node(self):
+        return self._net.node_ids[self._get('end')]
+
+    def _set_geometry(self, name, value):
+        self._set(name, value)
+        self._net.mark_changed(pipes=[self.index])
+
+    @property
+    def length(self):
+        """Length (m)."""
+        return self._get('length')
+
+    @length.setter
+    def length(self, value):
+        self._set_geometry('length', value)
+
+    @property
+    def diameter(self):
+        """Diameter (m)."""
+        return self._get('diameter')
+
+    @diameter.setter
+    def diameter(self, value):
+        self._set_geometry('diameter', value)
+
+    @property
+    def c(self):
+        """Hazen-Williams C factor."""
+        return self._get('c')
+
+    @c.setter
+    def c(self, value):
+        self._set_geometry('c', value)
+
+    @property
+    def roughness(self):
+        """Absolute roughness (m)."""
+        return self._get('roughness')
+
+    @roughness.setter
+    def roughness(self, value):
+        self._set_geometry('roughness', value)
+
+    @property
+    def flow_rate(self):
+        """Flow (m^3/s), positive from start_node to end_node."""
+        return self._get('flow')
+
+    @flow_rate.setter
+    def flow_rate(self, value):
+        if (value >= 0) != (self._get('flow') >= 0):
+            self._net.invalidate_adjacency(directed_only=True)
+        self._set('flow', value)
+
+    @property
+    def velocity(self):
+        return self._get('velocity')
+
+    @velocity.setter
+    def velocity(self, value):
+        self._set('velocity', value)
+
+    @property
+    def head_loss(self):
+        return self._get('head_loss')
+
+    @head_loss.setter
+    def head_loss(self, value):
+        self._set('head_loss', value)
 
     def calculate_head_loss(self):
-        # Hazen-Williams equation: hf = 10.67 * L * Q^1.852 / (C^1.852 * D^4.87)
-        q_abs = abs(self.flow_rate)
-        if q_abs < 1e-9:
-            self.head_loss = 0
-            return 0
-        
-        loss = (10.67 * self.length * (q_abs ** 1.852)) / (self.c ** 1.852 * self.diameter ** 4.87)
-        self.head_loss = loss * np.sign(self.flow_rate)
+        # Hazen-Williams: hf = 10.67 * L * Q^1.852 / (C^1.852 * D^4.87)
+        # Darcy-Weisbach: hf = f * (L / D) * v^2 / 2g
+        model = self._net.loss_model
+        k = model.resistance(np.array([self.flow_rate]), [self.index])[0]
+        self.head_loss = power_law_head_loss(self.flow_rate, k, model.exponent)
         return self.head_loss
 
     def update_velocity(self):
-        area = np.pi * (self.diameter / 2)**2
-        self.velocity = self.flow_rate / area if area > 0 else 0
+        self.velocity = pipe_velocity(self.flow_rate, self.diameter)
+
 
 class Node:
-    def __init__(self, id, x, y, elevation=0, demand=0):
-        self.id = id
-        self.pos = np.array([x, y, 0])
-        self.elevation = elevation # m
-        self.demand = demand # m^3/s (+ is demand OUT, - is source IN)
-        self.head = 0.0
-        self.pressure = 0.0 # kPa
+    """View onto one row of a WaterNetwork's node arrays."""
+    __slots__ = ('_net', 'index')
+
+    def __init__(self, network, index):
+        self._net = network
+        self.index = index
+
+    def _get(self, name):
+        return self._net._node_table.columns[name][self.index]
+
+    def _set(self, name, value):
+        self._net._node_table.columns[name][self.index] = value
+
+    @property
+    def id(self):
+        return self._net.node_ids[self.index]
+
+    @property
+    def pos(self):
+        """Position (x, y, 0) as a copy; the table row moves when the network grows."""
+        return self._get('pos').copy()
+
+    @property
+    def elevation(self):
+        """Elevation (m)."""
+        return self._get('elevation')
+
+    @elevation.setter
+    def elevation(self, value):
+        self._set('elevation', value)
+
+    @property
+    def demand(self):
+        """Demand (m^3/s): + is demand OUT, - is source IN."""
+        return self._get('demand')
+
+    @demand.setter
+    def demand(self, value):
+        self._set('demand', value)
+        self._net.mark_changed(nodes=[self.id])
+
+    @property
+    def head(self):
+        """Hydraulic head (m)."""
+        return self._get('head')
+
+    @head.setter
+    def head(self, value):
+        self._set('head', value)
+
+    @property
+    def pressure(self):
+        """Pressure (kPa)."""
+        return self._get('pressure')
+
+    @pressure.setter
+    def pressure(self, value):
+        self._set('pressure', value)
+
+
+class _GradientSystem:
+    """
+    Sparse structure of the global gradient method for one topology and one
+    set of fixed-head nodes. Between iterations and between demand
+    scenarios only the values of the Schur complement A21 D^-1 A12 change,
+    so its sparsity pattern, the map from 1/D to its entries and a
+    fill-reducing ordering of the free heads are computed once here.
+    Holds plain arrays only, so it pickles cheaply to worker processes.
+    """
+    def __init__(self, n_nodes, starts, ends, fixed):
+        n_pipes = len(starts)
+        free = np.flatnonzero(~fixed)
+        self.fixed = np.flatnonzero(fixed)
+
+        # Incidence: head loss along a pipe is H_start - H_end
+        rows = np.concatenate([np.arange(n_pipes), np.arange(n_pipes)])
+        cols = np.concatenate([starts, ends])
+        vals = np.concatenate([-np.ones(n_pipes), np.ones(n_pipes)])
+        A = sp.csc_matrix((vals, (rows, cols)), shape=(n_pipes, n_nodes))
+        A12 = A[:, free]
+
+        # Minimum-degree ordering from a unit-weight factorization; free
+        # heads are renumbered in that order so later factorizations can
+        # use the natural ordering without extra fill
+        order = np.arange(len(free))
+        if len(free):
+            unit = (A12.T @ A12 + sp.identity(len(free))).tocsc()
+            lu = splu(unit, permc_spec='MMD_AT_PLUS_A', diag_pivot_thresh=0, options=dict(SymmetricMode=True))
+            order = np.argsort(lu.perm_c)
+        self.free = free[order]
+        self.A12 = A12[:, order].tocsr()
+        self.A21 = self.A12.T.tocsr()
+        self.A10 = A[:, self.fixed].tocsr()
+
+        # Schur entry (i, j) sums A21[i, p] * A12[p, j] / D_p over pipes p:
+        # one diagonal term per free end, one off-diagonal pair per pipe
+        # joining two free heads
+        n_free = len(free)
+        position = np.full(n_nodes, -1)
+        position[self.free] = np.arange(n_free)
+        ps, pe = position[starts], position[ends]
+        pipe_idx = np.arange(n_pipes)
+        valid = np.asarray(starts) != np.asarray(ends)
+        both = valid & (ps >= 0) & (pe >= 0)
+        r = np.concatenate([ps[valid & (ps >= 0)], pe[valid & (pe >= 0)], ps[both], pe[both]])
+        c = np.concatenate([ps[valid & (ps >= 0)], pe[valid & (pe >= 0)], pe[both], ps[both]])
+        p = np.concatenate([pipe_idx[valid & (ps >= 0)], pipe_idx[valid & (pe >= 0)], pipe_idx[both], pipe_idx[both]])
+        sign = np.concatenate([np.ones(len(r) - 2 * both.sum()), -np.ones(2 * both.sum())])
+
+        pattern = sp.csc_matrix((np.ones(len(r)), (r, c)), shape=(n_free, n_free))
+        pattern.sum_duplicates()
+        self.indptr, self.indices = pattern.indptr, pattern.indices
+        keys = np.repeat(np.arange(n_free, dtype=np.int64), np.diff(self.indptr)) * n_free + self.indices
+        entry = np.searchsorted(keys, c.astype(np.int64) * n_free + r)
+        self.assembly = sp.csr_matrix((sign, (entry, p)), shape=(len(keys), n_pipes))
+
+    def solve(self, loss, demands, fixed_heads, flows, heads, max_iter=50, tol=1e-8):
+        """
+        Newton iterations for a stack of scenarios. Rows of the (scenarios x
+        free), (scenarios x fixed) and (scenarios x pipes) inputs follow
+        self.free / self.fixed / pipe order; converged scenarios drop out
+        of later iterations. `loss` is the network's head-loss model; a
+        flow-dependent resistance is re-evaluated every iteration.
+
+        Returns:
+            tuple: (flows, heads, residuals, iterations, converged) where
+                residuals is an (iterations x scenarios) array of max-abs
+                residuals, NaN after a scenario has converged; iterations
+                counts the Newton steps each scenario took and converged
+                flags the scenarios whose residual fell below tol.
+        """
+        flows = np.array(flows, dtype=float)
+        heads = np.array(heads, dtype=float)
+        n_scenarios, n_free = heads.shape
+        fixed_term = (self.A10 @ np.asarray(fixed_heads, dtype=float).T).T
+
+        active = np.arange(n_scenarios)
+        iterations = np.zeros(n_scenarios, dtype=np.int64)
+        converged = np.zeros(n_scenarios, dtype=bool)
+        history = []
+        n = loss.exponent
+        for _ in range(max_iter):
+            q, h = flows[active], heads[active]
+            q_abs = np.abs(q)
+            k = loss.resistance(q)
+            f_energy = k * q_abs**(n - 1) * q + (self.A12 @ h.T).T + fixed_term[active]
+            f_mass = (self.A21 @ q.T).T - demands[active]
+            residual = np.maximum(np.abs(f_energy).max(axis=1, initial=0), np.abs(f_mass).max(axis=1, initial=0))
+            row = np.full(n_scenarios, np.nan)
+            row[active] = residual
+            history.append(row)
+
+            keep = residual >= tol
+            converged[active[~keep]] = True
+            active, q, q_abs, h = active[keep], q[keep], q_abs[keep], h[keep]
+            k = k[keep] if np.ndim(k) == 2 else k
+            f_energy, f_mass = f_energy[keep], f_mass[keep]
+            if not active.size:
+                break
+
+            d_inv = 1.0 / loss.gradient(q, k)
+            data = np.ascontiguousarray((self.assembly @ d_inv.T).T)
+            rhs = f_mass - (self.A21 @ (d_inv * f_energy).T).T
+            dh = np.zeros_like(h)
+            for s in range(len(active) if n_free else 0):
+                schur = sp.csc_matrix((data[s], self.indices, self.indptr), shape=(n_free, n_free))
+                lu = splu(schur, permc_spec='NATURAL', diag_pivot_thresh=0, options=dict(SymmetricMode=True))
+                dh[s] = lu.solve(rhs[s])
+            flows[active] = q - d_inv * (f_energy + (self.A12 @ dh.T).T)
+            heads[active] = h + dh
+            iterations[active] += 1
+
+        return flows, heads, np.array(history).reshape(-1, n_scenarios), iterations, converged
+
 
 class WaterNetwork:
-    def __init__(self):
+    """
+    Pipe network stored as structure-of-arrays. `nodes` (dict by id) and
+    `pipes` (list) hold thin Node/Pipe views; the array properties below
+    expose whole columns for vectorized passes.
+
+    Args:
+        friction (str): 'hazen-williams' (uses each pipe's C) or
+            'darcy-weisbach' (uses each pipe's roughness and `viscosity`).
+        viscosity (float): Kinematic viscosity (m^2/s) for Darcy-Weisbach.
+    """
+    def __init__(self, friction='hazen-williams', viscosity=1.0e-6):
+        if friction not in ('hazen-williams', 'darcy-weisbach'):
+            raise ValueError(f"Unknown friction model: {friction}")
+        self.friction = friction
+        self.viscosity = viscosity
+        self._node_table = _Table({
+            'pos': (float, (3,)), 'elevation': (float, ()), 'demand': (float, ()),
+            'head': (float, ()), 'pressure': (float, ()),
+        })
+        self._pipe_table = _Table({
+            'start': (np.int64, ()), 'end': (np.int64, ()),
+            'length': (float, ()), 'diameter': (float, ()), 'c': (float, ()), 'roughness': (float, ()),
+            'flow': (float, ()), 'velocity': (float, ()), 'head_loss': (float, ()),
+        })
+        self.node_ids = []
+        self._node_index = {}
         self.nodes = {}
         self.pipes = []
         self.loops = []
+        self._loss_model = None
+        self._incidence = None
+        self._downstream = None
+        self._downstream_signs = None
+        self._tree = None
+        self._subtrees = None
+        self._gradient = None
+        self._loop_arrays = None
+        self._changed_pipes = set()
+        self._changed_nodes = set()
+
+    # --- Array views (live rows only, writable) ---
+    # Views point into the current buffers: re-read them after add_node(s)/add_pipe(s).
+
+    @property
+    def positions(self):
+        return self._node_table['pos']
+
+    @property
+    def elevations(self):
+        return self._node_table['elevation']
+
+    @property
+    def demands(self):
+        return self._node_table['demand']
+
+    @property
+    def heads(self):
+        return self._node_table['head']
+
+    @property
+    def pressures(self):
+        return self._node_table['pressure']
+
+    @property
+    def start_index(self):
+        return self._pipe_table['start']
+
+    @property
+    def end_index(self):
+        return self._pipe_table['end']
+
+    @property
+    def lengths(self):
+        return self._pipe_table['length']
+
+    @property
+    def diameters(self):
+        return self._pipe_table['diameter']
+
+    @property
+    def c_factors(self):
+        return self._pipe_table['c']
+
+    @property
+    def roughness(self):
+        return self._pipe_table['roughness']
+
+    @property
+    def flows(self):
+        return self._pipe_table['flow']
+
+    @property
+    def velocities(self):
+        return self._pipe_table['velocity']
+
+    @property
+    def head_losses(self):
+        return self._pipe_table['head_loss']
+
+    @property
+    def loss_model(self):
+        """Head-loss model for the chosen friction option, cached until geometry changes."""
+        if self._loss_model is None:
+            model = _DarcyWeisbach if self.friction == 'darcy-weisbach' else _HazenWilliams
+            self._loss_model = model(self)
+        return self._loss_model
+
+    @property
+    def flow_exponent(self):
+        """n in hf = k |Q|^n sign(Q): 1.852 for Hazen-Williams, 2 for Darcy-Weisbach."""
+        return self.loss_model.exponent
+
+    @property
+    def resistance(self):
+        """
+        Per-pipe k at the current flows. Constant (and cached) for
+        Hazen-Williams; re-evaluated from Colebrook for Darcy-Weisbach.
+        """
+        return self.loss_model.resistance(self.flows)
+
+    def invalidate_geometry(self):
+        """Call after writing lengths/diameters/c_factors/roughness arrays directly."""
+        self._loss_model = None
+
+    def invalidate_adjacency(self, directed_only=False):
+        """Call after adding pipes or writing the flows array directly."""
+        self._downstream = None
+        if not directed_only:
+            self._incidence = None
+            self._tree = None
+            self._subtrees = None
+            self._gradient = None
+            self._loop_arrays = None
+
+    @property
+    def incidence_csr(self):
+        """
+        Undirected adjacency as CSR arrays (indptr, neighbors, pipes, directions).
+        direction is +1 when the pipe is defined from the node to the neighbor.
+        Built once per topology.
+        """
+        if self._incidence is None:
+            n_pipes = len(self.pipes)
+            pipe_idx = np.arange(n_pipes)
+            self._incidence = _build_csr(
+                len(self.node_ids),
+                np.concatenate([self.start_index, self.end_index]),
+                np.concatenate([self.end_index, self.start_index]),
+                np.concatenate([pipe_idx, pipe_idx]),
+                np.concatenate([np.ones(n_pipes, dtype=np.int8), -np.ones(n_pipes, dtype=np.int8)]),
+            )
+        return self._incidence
+
+    @property
+    def downstream_csr(self):
+        """
+        Flow-directed adjacency as CSR arrays (indptr, neighbors, pipes).
+        Rebuilt only when pipes are added or a flow changes sign.
+        """
+        if self._downstream is None:
+            signs = self.flows >= 0
+            upstream = np.where(signs, self.start_index, self.end_index)
+            downstream = np.where(signs, self.end_index, self.start_index)
+            self._downstream = _build_csr(
+                len(self.node_ids), upstream, downstream, np.arange(len(self.pipes))
+            )
+            self._downstream_signs = signs
+        return self._downstream
+
+    def spanning_tree(self, root_id):
+        """
+        Breadth-first spanning tree over node indices, cached per root until
+        pipes are added. Returns (order, parent, parent_pipe, direction):
+        `order` lists reachable nodes root first; for every other reached
+        node v, pipe parent_pipe[v] joins parent[v] to v and direction[v] is
+        +1 when that pipe is defined from parent to child. The root and
+        unreached nodes have parent -1.
+        """
+        root = self._node_index[root_id]
+        if self._tree is None or self._tree[0] != root:
+            indptr, neighbors, pipes, directions = self.incidence_csr
+            n = len(self.node_ids)
+            graph = sp.csr_matrix((np.ones(len(neighbors)), neighbors, indptr), shape=(n, n))
+            order, pred = breadth_first_order(graph, root, directed=True)
+            parent = np.where(pred < 0, -1, pred)
+
+            # CSR entry (child -> parent) that carries each tree edge
+            rows = np.repeat(np.arange(n), np.diff(indptr))
+            match = np.flatnonzero(neighbors == parent[rows])
+            entry = np.full(n, -1)
+            entry[rows[match]] = match
+            has_parent = parent >= 0
+            parent_pipe = np.full(n, -1)
+            parent_pipe[has_parent] = pipes[entry[has_parent]]
+            direction = np.zeros(n, dtype=np.int8)
+            direction[has_parent] = -directions[entry[has_parent]]
+            self._tree = (root, order, parent, parent_pipe, direction)
+        return self._tree[1:]
+
+    def _subtree_ranges(self, root_id):
+        """
+        Depth-first preorder of the spanning tree from root_id, cached with
+        it. Returns (preorder, position, size, tree_child): the subtree of
+        node v is preorder[position[v]:position[v] + size[v]], and
+        tree_child[p] is the node a tree pipe p leads to (-1 for chords).
+        """
+        order, parent, parent_pipe, _ = self.spanning_tree(root_id)
+        root = self._node_index[root_id]
+        if self._subtrees is None or self._subtrees[0] != root:
+            n = len(self.node_ids)
+            child = order[1:]
+            tree = sp.csr_matrix((np.ones(len(child)), (parent[child], child)), shape=(n, n))
+            preorder = depth_first_order(tree, root, directed=True, return_predecessors=False)
+            position = np.full(n, -1)
+            position[preorder] = np.arange(len(preorder))
+
+            # Subtree sizes, one vectorized pass per tree level, deepest first
+            depth = _accumulate_to_root(parent, np.where(parent >= 0, 1, 0))
+            size = np.where(position >= 0, 1, 0)
+            by_depth = child[np.argsort(-depth[child], kind='stable')]
+            bounds = np.flatnonzero(np.diff(depth[by_depth])) + 1
+            for level in np.split(by_depth, bounds):
+                np.add.at(size, parent[level], size[level])
+            tree_child = np.full(len(self.pipes), -1)
+            tree_child[parent_pipe[child]] = child
+            self._subtrees = (root, preorder, position, size, tree_child)
+        return self._subtrees[1:]
+
+    def _flows_updated(self):
+        # Solvers write the flows array in bulk; only a sign flip changes topology
+        if self._downstream is not None and np.any((self.flows >= 0) != self._downstream_signs):
+            self._downstream = None
+
+    def node_index(self, node_id):
+        return self._node_index[node_id]
 
     def add_node(self, id, x, y, elevation=0, demand=0):
-        self.nodes[id] = Node(id, x, y, elevation, demand)
+        self.add_nodes([id], [x], [y], elevation, demand)
+
+    def add_nodes(self, ids, x, y, elevation=0, demand=0):
+        """Bulk version of add_node; coordinates and properties are array-like."""
+        ids = list(ids)
+        pos = np.zeros((len(ids), 3))
+        pos[:, 0] = x
+        pos[:, 1] = y
+        rows = self._node_table.extend(len(ids), pos=pos, elevation=elevation, demand=demand)
+        for idx, nid in zip(range(rows.start, rows.stop), ids):
+            self.node_ids.append(nid)
+            self._node_index[nid] = idx
+            self.nodes[nid] = Node(self, idx)
+
+    def add_pipe(self, start_id, end_id, length, diameter, c=130, roughness=1.5e-6):
+        self.add_pipes([start_id], [end_id], length, diameter, c, roughness)
+
+    def add_pipes(self, start_ids, end_ids, lengths, diameters, c=130, roughness=1.5e-6):
+        """Bulk version of add_pipe; end points are node ids, roughness is in m."""
+        start = np.array([self._node_index[nid] for nid in start_ids], dtype=np.int64)
+        end = np.array([self._node_index[nid] for nid in end_ids], dtype=np.int64)
+        rows = self._pipe_table.extend(
+            len(start), start=start, end=end, length=lengths, diameter=diameters, c=c, roughness=roughness
+        )
+        self.pipes.extend(Pipe(self, idx) for idx in range(rows.start, rows.stop))
+        self.invalidate_geometry()
+        self.invalidate_adjacency()
+
+    def mark_changed(self, pipes=(), nodes=()):
+        """
+        Records edits for the next resolve(). Pipe and Node setters call
+        this themselves; call it after writing the arrays directly.
 
-    def add_pipe(self, start_id, end_id, length, diameter, c=130):
-        self.pipes.append(Pipe(start_id, end_id, length, diameter, c))
+        Args:
+            pipes: Pipe indices whose length, diameter, C or roughness changed.
+            nodes: Node ids whose demand changed.
+        """
+        pipes = np.asarray(pipes, dtype=np.int64)
+        if self._loss_model is not None and pipes.size:
+            self._loss_model.refresh(self, pipes)
+        self._changed_pipes.update(pipes.tolist())
+        self._changed_nodes.update(nodes)
 
     def define_loops(self, loop_indices):
         self.loops = loop_indices
 
-    def solve_hardy_cross(self, max_iter=100, tol=1e-5):
-        for _ in range(max_iter):
+    def detect_loops(self):
+        """
+        Finds a short, independent set of loops automatically and uses them
+        for Hardy Cross. Returns the loops in define_loops format.
+        """
+        self.loops = fundamental_loops(len(self.node_ids), self.start_index, self.end_index)
+        return self.loops
+
+    def update_hydraulics(self):
+        """Recomputes head loss and velocity for every pipe in one pass."""
+        self.head_losses[:] = power_law_head_loss(self.flows, self.resistance, self.flow_exponent)
+        self.velocities[:] = pipe_velocity(self.flows, self.diameters)
+
+    def update_pressures(self):
+        self.pressures[:] = 9.81 * (self.heads - self.elevations)
+
+    def _compiled_loops(self):
+        """
+        Loops as (pipe indices, directions) arrays plus the signed loop-pipe
+        incidence matrix (loops x pipes, CSR) and its transpose, rebuilt
+        when `loops` is replaced.
+        """
+        if self._loop_arrays is None or self._loop_arrays[0] is not self.loops:
+            loops = [
+                (np.array([idx for idx, _ in loop], dtype=int), np.array([d for _, d in loop], dtype=float))
+                for loop in self.loops
+            ]
+            incidence = sp.csr_matrix(
+                (np.concatenate([d for _, d in loops] or [np.zeros(0)]),
+                 (np.repeat(np.arange(len(loops)), [len(idx) for idx, _ in loops]),
+                  np.concatenate([idx for idx, _ in loops] or [np.zeros(0, dtype=int)]))),
+                shape=(len(loops), len(self.pipes)),
+            )
+            self._loop_arrays = (self.loops, loops, incidence, incidence.T.tocsr())
+        return self._loop_arrays[1:]
+
+    @staticmethod
+    def _loop_correction(flows, resistance, pipe_idx, direction, n):
+        """Hardy Cross circulation correction for one loop, or None if it has no moving pipes."""
+        q = flows[pipe_idx]
+        h_segment = resistance[pipe_idx] * np.abs(q)**n * np.sign(q) * direction
+        sum_h = h_segment.sum()
+        moving = np.abs(q) > 1e-9
+        sum_h_prime = (np.abs(h_segment[moving]) / np.abs(q[moving])).sum()
+
+        if sum_h_prime == 0: return None
+        return -sum_h / (n * sum_h_prime)
+
+    def solve_hardy_cross(self, max_iter=100, tol=1e-5, anderson=0):
+        """
+        Loop-by-loop Hardy Cross correction. With anderson=m > 0, each sweep
+        is treated as a fixed-point map on the flow vector and Anderson
+        mixing over the last m sweeps picks the next flows.
+        Returns the number of sweeps run.
+        """
+        accelerator = AndersonAccelerator(memory=anderson) if anderson else None
+        flows = self.flows
+        n = self.flow_exponent
+        loops, _, _ = self._compiled_loops()
+        sweeps = 0
+        for sweeps in range(1, max_iter + 1):
+            previous = flows.copy()
             max_correction = 0
-            for loop in self.loops:
-                sum_h = 0
-                sum_h_prime = 0
-                for pipe_idx, direction in loop:
-                    p = self.pipes[pipe_idx]
-                    k = 10.67 * p.length / (p.c ** 1.852 * p.diameter ** 4.87)
-                    h_loss = k * abs(p.flow_rate)**1.852 * np.sign(p.flow_rate)
-                    h_segment = h_loss * direction
-                    sum_h += h_segment
-                    if abs(p.flow_rate) > 1e-9:
-                        sum_h_prime += abs(h_segment) / abs(p.flow_rate)
-                
-                if sum_h_prime == 0: continue
-                delta_q = -sum_h / (1.852 * sum_h_prime)
-                
-                for pipe_idx, direction in loop:
-                    self.pipes[pipe_idx].flow_rate += delta_q * direction
+            resistance = self.resistance
+            for pipe_idx, direction in loops:
+                delta_q = self._loop_correction(flows, resistance, pipe_idx, direction, n)
+                if delta_q is None: continue
+
+                flows[pipe_idx] += delta_q * direction
                 max_correction = max(max_correction, abs(delta_q))
-                
+
             if max_correction < tol: break
-        
-        for p in self.pipes:
-            p.calculate_head_loss()
-            p.update_velocity()
+            if accelerator is not None:
+                flows[:] = accelerator.update(previous, flows)
+
+        self._flows_updated()
+        self.update_hydraulics()
+        self._changed_pipes.clear()
+        self._changed_nodes.clear()
+        return sweeps
+
+    def resolve(self, source_node_id, max_iter=100, tol=1e-5, head_tol=1e-3, max_loops=20000):
+        """
+        Incremental re-solve after local edits recorded by mark_changed,
+        starting from the previous converged state (flows from a network
+        solve, heads from calculate_pressures with the same source).
+
+        Demand changes are first routed from the source along the spanning
+        tree so continuity holds again. Only the loops through edited pipes
+        are then balanced: Newton on the region's reduced loop system runs
+        until its corrections drop below `tol`. Only the loops bordering the
+        balanced region are checked next; those whose Hardy Cross correction
+        exceeds `tol` or whose head imbalance exceeds `head_tol` (m) join it
+        with their neighbors, the neighborhood depth doubling each round.
+        Finally only the subtrees below tree pipes whose head loss changed
+        get their heads shifted. Per-step work scales with the region, not
+        the network, once the loops, spanning tree and subtree ranges are
+        built (they are cached across calls).
+
+        Once the region holds more than `max_loops` loops the edit is not
+        local, and a warm-started solve_global_newton with the source head
+        fixed finishes the job instead. The budget is absolute, so small
+        networks are always balanced locally.
+
+        Returns:
+            int: Number of Newton steps run (local and full).
+        """
+        _, parent, parent_pipe, direction = self.spanning_tree(source_node_id)
+        flows = self.flows
+        n = self.flow_exponent
+        _, loop_pipe, pipe_loop = self._compiled_loops()
+        indptr, _, incident, outgoing = self.incidence_csr
+        touched = set(self._changed_pipes)
+
+        for nid in self._changed_nodes:
+            v = self._node_index[nid]
+            span = slice(indptr[v], indptr[v + 1])
+            inflow = -(outgoing[span] * flows[incident[span]]).sum()
+            shortfall = self.demands[v] - inflow
+            if abs(shortfall) < 1e-12: continue
+            while parent[v] >= 0:
+                flows[parent_pipe[v]] += direction[v] * shortfall
+                touched.add(int(parent_pipe[v]))
+                v = parent[v]
+
+        touched = np.fromiter(touched, dtype=np.int64, count=len(touched))
+        model = self.loss_model
+        region = np.unique(pipe_loop[touched].indices)
+        changed = touched
+        steps = 0
+        layers = 1
+
+        def loop_terms(loop_rows):
+            # Loop-pipe matrix restricted to its pipes, with h and dh/dQ there
+            M = loop_pipe[loop_rows]
+            cols = np.unique(M.indices)
+            q = flows[cols]
+            k = model.resistance(q, cols)
+            g = model.gradient(q, k, cols)
+            return M[:, cols], cols, k * np.abs(q)**n * np.sign(q), g
+
+        while region.size and steps < max_iter:
+            if region.size > max_loops:
+                # The edit is not local: warm-started full solve instead
+                source = self._node_index[source_node_id]
+                return steps + self.solve_global_newton({source_node_id: self.heads[source]}, max_iter, tol).iterations
+
+            # Newton on the region's reduced loop system until it balances
+            while steps < max_iter:
+                steps += 1
+                M, pipes, h, g = loop_terms(region)
+                dq = np.atleast_1d(spsolve((M @ sp.diags(g) @ M.T).tocsc(), -(M @ h)))
+                flows[pipes] += M.T @ dq
+                if np.abs(dq).max() < tol: break
+            changed = np.union1d(changed, pipes)
+
+            # Hardy Cross check of the loops bordering the region
+            ring = np.setdiff1d(pipe_loop[pipes].indices, region)
+            if not ring.size: break
+            M, _, h, g = loop_terms(ring)
+            imbalance = np.abs(M @ h)
+            unbalanced = ring[(imbalance >= tol * (abs(M) @ g)) | (imbalance >= head_tol)]
+            if not unbalanced.size: break
+            # Unbalanced loops join with `layers` rings of neighbors; doubling
+            # the depth each round keeps the number of rounds logarithmic
+            grow = unbalanced
+            for _ in range(layers):
+                grow = np.union1d(grow, pipe_loop[loop_pipe[grow].indices].indices)
+            region = np.union1d(region, grow)
+            layers *= 2
+
+        # Refresh edited pipes and shift heads below changed tree pipes
+        touched = changed
+        old_loss = self.head_losses[touched].copy()
+        self.head_losses[touched] = power_law_head_loss(
+            flows[touched], self.loss_model.resistance(flows[touched], touched), n
+        )
+        self.velocities[touched] = pipe_velocity(flows[touched], self.diameters[touched])
+
+        # Subtrees are contiguous in preorder: add each shift at the subtree
+        # start, remove it at the end and take a running sum over the span
+        preorder, position, size, tree_child = self._subtree_ranges(source_node_id)
+        v = tree_child[touched]
+        moved = (v >= 0) & (self.head_losses[touched] != old_loss)
+        v = v[moved]
+        if v.size:
+            shift = -direction[v] * (self.head_losses[touched[moved]] - old_loss[moved])
+            lo, hi = position[v].min(), (position[v] + size[v]).max()
+            running = np.zeros(hi - lo + 1)
+            np.add.at(running, position[v] - lo, shift)
+            np.add.at(running, position[v] + size[v] - lo, -shift)
+            below = preorder[lo:hi]
+            self.heads[below] += np.cumsum(running)[:-1]
+            self.pressures[below] = 9.81 * (self.heads[below] - self.elevations[below])
+
+        self._flows_updated()
+        self._changed_pipes.clear()
+        self._changed_nodes.clear()
+        return steps
+
+    def solve_global_newton(self, fixed_heads, max_iter=50, tol=1e-8):
+        """
+        Solves all pipe flows and node heads simultaneously with the global
+        gradient (Newton-Raphson) method of Todini & Pilati.
+
+        Unknowns are every pipe flow and every free node head. Each iteration
+        linearizes the head-loss terms (for Darcy-Weisbach including the
+        change of the friction factor with flow) and reduces the Newton
+        system to the sparse Schur complement A21 D^-1 A12 on the free
+        heads, so no loop definitions are needed and convergence is
+        quadratic.
+
+        Args:
+            fixed_heads (dict): {node_id: head} for reservoir/source nodes.
+                Demands on these nodes are ignored; they supply whatever
+                the rest of the network draws.
+            max_iter (int): Maximum Newton iterations.
+            tol (float): Convergence threshold on the max-abs residual of
+                the energy (m) and continuity (m^3/s) equations.
+
+        Returns:
+            NewtonResult: (residuals, iterations, converged): the max-abs
+                residual at the start of each iteration (list), the number
+                of Newton steps taken and whether tol was reached.
+        """
+        system = self._gradient_system(fixed_heads)
+        heads = self.heads
+        for nid, h in fixed_heads.items():
+            heads[self._node_index[nid]] = h
+
+        flows, h_free, residuals, iterations, converged = system.solve(
+            self.loss_model, self.demands[system.free][None], heads[system.fixed][None],
+            self._starting_flows()[None], heads[system.free][None], max_iter, tol,
+        )
+        heads[system.free] = h_free[0]
+        self.flows[:] = flows[0]
+        self._flows_updated()
+        self.update_hydraulics()
+        self.update_pressures()
+        self._changed_pipes.clear()
+        self._changed_nodes.clear()
+        return NewtonResult(residuals[:, 0].tolist(), int(iterations[0]), bool(converged[0]))
+
+    def solve_scenarios(self, demands, fixed_heads, max_iter=50, tol=1e-8, workers=None):
+        """
+        Solves many demand patterns over this network in one call with the
+        global gradient method. All scenarios share the topology, the Schur
+        complement structure and its fill-reducing ordering; only the
+        numerical factorizations differ. The network itself is not modified.
+
+        Args:
+            demands (array): (scenarios x nodes) demands, columns in
+                `node_ids` order.
+            fixed_heads (dict): {node_id: head}; a head may also be an
+                array with one value per scenario.
+            max_iter (int): Maximum Newton iterations per scenario.
+            tol (float): Convergence threshold, as in solve_global_newton.
+            workers (int): If given, scenarios are split into chunks that
+                are solved in a pool of this many processes.
+
+        Returns:
+            tuple: (flows, heads, pressures) stacked per scenario, shaped
+                (scenarios x pipes), (scenarios x nodes), (scenarios x nodes).
+        """
+        demands = np.atleast_2d(np.asarray(demands, dtype=float))
+        n_scenarios = len(demands)
+        system = self._gradient_system(fixed_heads)
+        heads = np.tile(self.heads, (n_scenarios, 1))
+        for nid, h in fixed_heads.items():
+            heads[:, self._node_index[nid]] = h
+        flows = np.tile(self._starting_flows(), (n_scenarios, 1))
+
+        args = (self.loss_model, demands[:, system.free], heads[:, system.fixed], flows, heads[:, system.free])
+        if workers is None:
+            flows, heads[:, system.free], *_ = system.solve(*args, max_iter, tol)
+        else:
+            chunks = [c for c in np.array_split(np.arange(n_scenarios), workers) if c.size]
+            with ProcessPoolExecutor(workers) as pool:
+                futures = [
+                    pool.submit(system.solve, args[0], *(a[c] for a in args[1:]), max_iter, tol)
+                    for c in chunks
+                ]
+                for c, future in zip(chunks, futures):
+                    flows[c], heads[np.ix_(c, system.free)], *_ = future.result()
+
+        pressures = 9.81 * (heads - self.elevations)
+        return flows, heads, pressures
+
+    def simulate_extended_period(self, fixed_heads, tanks, n_steps, time_step=3600.0,
+                                 demand_multipliers=None, out_dir=None, max_iter=50, tol=1e-8):
+        """
+        Extended-period simulation: a sequence of steady-state solves with
+        tank levels and demands updated between steps.
+
+        Tanks act as fixed-head nodes at elevation + level; after each step
+        their level changes by net inflow * time_step / area. Each solve is
+        warm-started from the previous step's flows, so after the first step
+        Newton typically needs only a few iterations.
+
+        Args:
+            fixed_heads (dict): {node_id: head} for constant-head reservoirs.
+            tanks (dict): {node_id: {'area': m^2, 'level': m}} with optional
+                'min_level'/'max_level' limits. Levels are not modified.
+            n_steps (int): Number of time steps.
+            time_step (float): Step length (s).
+            demand_multipliers (array): Factor on the base demands per step,
+                repeated when shorter than n_steps (e.g. 24 hourly values).
+            out_dir (str): If given, results are streamed step by step into
+                .npy files in this directory (opened as memory maps) instead
+                of being held in memory.
+
+        Returns:
+            dict: 'flows' (steps x pipes), 'heads' and 'pressures'
+                (steps x nodes), 'tank_levels' (steps x tanks, at the start of
+                each step), 'iterations' (Newton steps), 'converged' and
+                'solve_time' (s) per step.
+        """
+        n_pipes, n_nodes = len(self.pipes), len(self.node_ids)
+        shapes = {
+            'flows': ((n_steps, n_pipes), float), 'heads': ((n_steps, n_nodes), float),
+            'pressures': ((n_steps, n_nodes), float), 'tank_levels': ((n_steps, len(tanks)), float),
+            'iterations': ((n_steps,), np.int64), 'converged': ((n_steps,), bool),
+            'solve_time': ((n_steps,), float),
+        }
+        if out_dir is None:
+            results = {name: np.zeros(shape, dtype) for name, (shape, dtype) in shapes.items()}
+        else:
+            os.makedirs(out_dir, exist_ok=True)
+            results = {
+                name: np.lib.format.open_memmap(os.path.join(out_dir, f"{name}.npy"), mode='w+', dtype=dtype, shape=shape)
+                for name, (shape, dtype) in shapes.items()
+            }
+
+        tank_idx = np.array([self._node_index[nid] for nid in tanks], dtype=np.int64)
+        area = np.array([t['area'] for t in tanks.values()], dtype=float)
+        level = np.array([t['level'] for t in tanks.values()], dtype=float)
+        min_level = np.array([t.get('min_level', 0.0) for t in tanks.values()], dtype=float)
+        max_level = np.array([t.get('max_level', np.inf) for t in tanks.values()], dtype=float)
+        multipliers = np.ones(1) if demand_multipliers is None else np.asarray(demand_multipliers, dtype=float)
+        base_demands = self.demands.copy()
+
+        try:
+            for step in range(n_steps):
+                self.demands[:] = base_demands * multipliers[step % len(multipliers)]
+                step_heads = dict(fixed_heads)
+                step_heads.update(zip(tanks, self.elevations[tank_idx] + level))
+
+                start = time.perf_counter()
+                newton = self.solve_global_newton(step_heads, max_iter, tol)
+                results['solve_time'][step] = time.perf_counter() - start
+                results['iterations'][step] = newton.iterations
+                results['converged'][step] = newton.converged
+                results['flows'][step] = self.flows
+                results['heads'][step] = self.heads
+                results['pressures'][step] = self.pressures
+                results['tank_levels'][step] = level
+
+                # Net inflow per node: flow arriving at pipe ends minus flow leaving starts
+                inflow = (np.bincount(self.end_index, self.flows, n_nodes)
+                          - np.bincount(self.start_index, self.flows, n_nodes))
+                level = np.clip(level + inflow[tank_idx] * time_step / area, min_level, max_level)
+        finally:
+            self.demands[:] = base_demands
+            if out_dir is not None:
+                for array in results.values():
+                    array.flush()
+        return results
+
+    def _gradient_system(self, fixed_heads):
+        """_GradientSystem for the given fixed-head nodes, cached until pipes are added."""
+        if not fixed_heads:
+            raise ValueError("At least one fixed-head node is required")
+        key = (len(self.node_ids), frozenset(fixed_heads))
+        if self._gradient is None or self._gradient[0] != key:
+            fixed = np.zeros(len(self.node_ids), dtype=bool)
+            fixed[[self._node_index[nid] for nid in fixed_heads]] = True
+            self._gradient = (key, _GradientSystem(len(self.node_ids), self.start_index, self.end_index, fixed))
+        return self._gradient[1]
+
+    def _starting_flows(self):
+        # EPANET-style start: pipes without a guess get ~1 ft/s
+        area = np.pi * (self.diameters / 2)**2
+        return np.where(self.flows == 0, 0.3048 * area, self.flows)
 
     def get_downstream_neighbors(self, node_id):
         """
         Returns a list of (neighbor_id, pipe) for all outgoing flow from node_id.
         """
-        downstream = []
-        # We could pre-compute this, but iterating pipes is fine for small networks
-        for p in self.pipes:
-            # Determine flow direction
-            if p.flow_rate >= 0:
-                u, v = p.start_node, p.end_node
-            else:
-                u, v = p.end_node, p.start_node
-            
-            if u == node_id:
-                downstream.append((v, p))
-        return downstream
+        indptr, neighbors, pipes = self.downstream_csr
+        u = self._node_index[node_id]
+        span = slice(indptr[u], indptr[u + 1])
+        return [(self.node_ids[v], self.pipes[p]) for v, p in zip(neighbors[span], pipes[span])]
 
     def calculate_pressures(self, source_node_id, source_head):
-        self.nodes[source_node_id].head = source_head
-        visited = set([source_node_id])
-        queue = [source_node_id]
-        adj = {n: [] for n in self.nodes}
-        for i, p in enumerate(self.pipes):
-            adj[p.start_node].append((p.end_node, p, 1))
-            adj[p.end_node].append((p.start_node, p, -1))
-            
-        while queue:
-            u_id = queue.pop(0)
-            u = self.nodes[u_id]
-            for v_id, pipe, direction in adj[u_id]:
-                if v_id not in visited:
-                    if direction == 1:
-                        self.nodes[v_id].head = u.head - pipe.head_loss
-                    else:
-                        self.nodes[v_id].head = u.head + pipe.head_loss
-                    visited.add(v_id)
-                    queue.append(v_id)
-        
-        for n in self.nodes.values():
-            n.pressure = 9.81 * (n.head - n.elevation)
+        """
+        Propagates heads from the source along a breadth-first spanning tree
+        (H_child = H_parent -/+ hf) and updates pressures. The path sums use
+        pointer jumping (see _accumulate_to_root): O(n log depth) work in a
+        few vectorized passes. Nodes not connected to the source keep their
+        previous head.
+        """
+        order, parent, parent_pipe, direction = self.spanning_tree(source_node_id)
+        has_parent = parent >= 0
+        delta = np.zeros(len(parent))
+        delta[has_parent] = -direction[has_parent] * self.head_losses[parent_pipe[has_parent]]
+        self.heads[order] = source_head + _accumulate_to_root(parent, delta)[order]
+
+        self.update_pressures()
+
+
+def build_network(net_config, physics):
+    """
+    WaterNetwork for an inputs.yaml `network` section: nodes in file order,
+    pipes sorted by ID, each pipe carrying its configured `flow` (0 if absent).
+    """
+    net = WaterNetwork()
+    nodes = list(net_config['nodes'].values())
+    net.add_nodes(
+        [n['id'] for n in nodes], [n['pos'][0] for n in nodes], [n['pos'][1] for n in nodes],
+        elevation=[n['elevation'] for n in nodes], demand=[n['demand'] for n in nodes]
+    )
+    pipes = sorted(net_config['pipes'].values(), key=lambda p: p.get('id', 999))
+    net.add_pipes(
+        [p['start'] for p in pipes], [p['end'] for p in pipes],
+        [p['length'] for p in pipes], [p['diameter'] for p in pipes],
+        c=physics.get('default_roughness', 100)
+    )
+    net.flows[:] = [p.get('flow', 0) for p in pipes]
+    return net
+
+
+def solve_configured_flows(net_config, physics):
+    """
+    Hydraulics of a branch network whose pipe flows are prescribed in the
+    config: velocity and head loss per pipe, then heads and pressures
+    propagated from the source node (type "source", else node 0) at
+    physics['source_pressure_head'].
+
+    Returns:
+        dict: 'velocities', 'head_losses' (pipe order of build_network) and
+            'heads', 'pressures' (node order) as arrays.
+    """
+    net = build_network(net_config, physics)
+    net.update_hydraulics()
+    source_id = next((n['id'] for n in net_config['nodes'].values() if n.get('type') == 'source'), 0)
+    net.calculate_pressures(source_id, physics['source_pressure_head'])
+    return {name: getattr(net, name).copy() for name in ('velocities', 'head_losses', 'heads', 'pressures')}
@@ -1,12 +1,13 @@
-import yaml
-import os
+from hydraulics.cache import load_yaml
 
-def load_config(file_path):
+def load_config(file_path, required=()):
     """
-    Loads a YAML configuration file.
+    Loads a YAML configuration file, reusing the parsed result cached next
+    to it while the file is unchanged.
     
     Args:
         file_path (str): Absolute or relative path to the YAML file.
+        required (tuple): Top-level sections the file must define.
         
     Returns:
         dict: The configuration dictionary.
@@ -14,14 +15,6 @@ def load_config(file_path):
     Raises:
         FileNotFoundError: If the file does not exist.
         yaml.YAMLError: If there is an error parsing the YAML file.
+        ValueError: If the file is not a mapping or lacks a required section.
     """
-    abs_path = os.path.abspath(file_path)
-    if not os.path.exists(abs_path):
-        raise FileNotFoundError(f"Configuration file not found: {abs_path}")
-        
-    with open(abs_path, 'r') as f:
-        try:
-            config = yaml.safe_load(f)
-            return config
-        except yaml.YAMLError as e:
-            raise yaml.YAMLError(f"Error parsing YAML file {abs_path}: {e}")
+    return load_yaml(file_path, required)
@@ -4,90 +4,47 @@ import heapq
 import sys
 import os
 
-# Ensure we can import from the same directory
+# Import helpers/ from this folder and the shared hydraulics package and
+# render_profiles from the Animations folder above it
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from helpers.physics import WaterNetwork
+from hydraulics.cache import ConfigCache
+from helpers.physics import build_network, solve_configured_flows
 from helpers.geometry import create_network_mobjects
 from helpers.annotations import create_velocity_labels, create_node_labels, get_p_color
-from helpers.utils import load_config
+from render_profiles import apply_profile
 
-# --- Load Configuration ---
+# --- Load Configuration (parsed YAML and the network solve are cached next to it) ---
 script_dir = os.path.dirname(os.path.abspath(__file__))
-INPUTS = load_config(os.path.join(script_dir, 'inputs.yaml'))
+CACHE = ConfigCache(
+    os.path.join(script_dir, 'inputs.yaml'),
+    sources=(os.path.join(script_dir, 'helpers', 'physics.py'),),
+    required=('network', 'global', 'display')
+)
+INPUTS = CACHE.config
 NET_CONFIG = INPUTS['network']
 GLOBAL_PHYSICS = INPUTS['global']['physics']
 DISPLAY_CONFIG = INPUTS['display']
 
-config.pixel_height = 2160
-config.pixel_width = 3840
-config.frame_rate = 60
-config.disable_caching = True
+# 4K from manim.cfg unless RENDER_PROFILE picks a profile (see render_profiles.py)
+PROFILE = apply_profile(config)
+
+# Length (s) of each play the flow animation is cut into, so segmented
+# renders (render_all.py --segments) can spread it over processes
+FLOW_WINDOW = 0.5
 
 WX_BLUE = DISPLAY_CONFIG['colors']['water_blue']
 
 class WaterDistributionScene(Scene):
     def construct(self):
-        # 1. Physics: Setup and Solve Network from Config
-        net = WaterNetwork()
-        
-        # Load Nodes
-        for node_key, node_data in NET_CONFIG['nodes'].items():
-            net.add_node(
-                id=node_data['id'],
-                x=node_data['pos'][0],
-                y=node_data['pos'][1],
-                elevation=node_data['elevation'],
-                demand=node_data['demand']
-            )
-            
-        # Load Pipes
-        # Sorting by ID to ensure consistent indexing if needed
-        sorted_pipes = sorted(NET_CONFIG['pipes'].items(), key=lambda item: item[1].get('id', 999))
-        
-        for pipe_key, pipe_data in sorted_pipes:
-            net.add_pipe(
-                start_id=pipe_data['start'],
-                end_id=pipe_data['end'],
-                length=pipe_data['length'],
-                diameter=pipe_data['diameter'],
-                c=GLOBAL_PHYSICS.get('default_roughness', 100)
-            )
-            
-        # MANUAL FLOW SETTING (For Dead-End / Branch Line)
-        # We set flow rates from config directly instead of solving
-        sorted_pipe_keys = [k for k, v in sorted_pipes]
-        
-        for i, (pipe_key, pipe_data) in enumerate(sorted_pipes):
-            # net.pipes list order matches insertion order.
-            # Since we inserted in sorted order of ID, i should match if IDs are 0..N
-            # But safer to just set it on the pipe object we just added implicitly?
-            # Actually net.pipes is a list.
-            # Let's verify: net.add_pipe appends to self.pipes.
-            # So net.pipes[i] corresponds to sorted_pipes[i].
-            
-            p = net.pipes[i]
-            if 'flow' in pipe_data:
-                p.flow_rate = pipe_data['flow']
-            else:
-                p.flow_rate = 0 # Default or Warning
-            
-            # Update Hydraulic Properties (Head Loss, Velocity)
-            p.calculate_head_loss()
-            p.update_velocity()
-
-        # No Loops defined for this topology
-        
-        # Propagate Pressure
-        # Assuming Node 0 is source
-        source_id = 0 
-        # Find source node from config if marked
-        for n_key, n_data in NET_CONFIG['nodes'].items():
-            if n_data.get('type') == 'source':
-                source_id = n_data['id']
-                break
-                
-        net.calculate_pressures(source_id, GLOBAL_PHYSICS['source_pressure_head'])
+        # 1. Physics: Build the network with the flows set in the config
+        # (dead-end / branch line, so nothing to solve for), then fill in
+        # velocities, head losses, heads and pressures from the cached solve
+        net = build_network(NET_CONFIG, GLOBAL_PHYSICS)
+        solution = CACHE.get('solution', solve_configured_flows, NET_CONFIG, GLOBAL_PHYSICS)
+        for name, values in solution.items():
+            getattr(net, name)[:] = values
 
         # 2. Geometry & Annotations
         title = Text("Branching Water Distribution System", font_size=36).to_edge(UP)
@@ -95,7 +52,8 @@ class WaterDistributionScene(Scene):
         self.play(Write(title), FadeIn(subtitle))
         
         pipe_mobjects, node_mobjects = create_network_mobjects(net)
-        labels = create_velocity_labels(net, pipe_mobjects)
+        # Draft renders skip the per-pipe/per-node Text labels
+        labels = create_velocity_labels(net, pipe_mobjects) if PROFILE.annotations else {}
         # node_labels = create_node_labels(net, node_mobjects)
         
         # for n, lbl in node_labels.items():
@@ -144,32 +102,49 @@ class WaterDistributionScene(Scene):
                     node_times[v] = arrival_time
                     heapq.heappush(pq, (arrival_time, v))
         
-        # Build Flat Animation List
-        all_anims = []
-        
-        # 1. Pipes
-        for p, (start_t, dur, u, v) in pipe_schedules.items():
-            start_pos = net.nodes[u].pos
-            end_pos = net.nodes[v].pos
-            water_line = Line(start_pos, end_pos, stroke_width=p.diameter*20, color=WX_BLUE)
-            
-            if start_t > 0:
-                anim = Succession(Wait(start_t), Create(water_line, run_time=dur, rate_func=linear))
-            else:
-                anim = Create(water_line, run_time=dur, rate_func=linear)
-            all_anims.append(anim)
-            
-        # 2. Nodes
-        for nid, t in node_times.items():
-            if t == float('inf'): continue 
-            if t > 0:
-                anim = Succession(Wait(t), node_mobjects[net.nodes[nid]].animate.set_color(WX_BLUE).set_run_time(0.2))
+        # Cut the schedule into plays of about FLOW_WINDOW seconds
+        arrivals = [t for t in node_times.values() if t != float('inf')]
+        end_time = max([t + 0.2 for t in arrivals] + [s + d for s, d, _, _ in pipe_schedules.values()])
+        cuts = [0.0]
+        while cuts[-1] + FLOW_WINDOW < end_time:
+            cut = cuts[-1] + FLOW_WINDOW
+            # Never cut through a node's 0.2 s color change
+            cut = max([cut] + [t + 0.2 for t in arrivals if t < cut < t + 0.2])
+            if cut < end_time:
+                cuts.append(cut)
             else:
+                break
+        cuts.append(end_time)
+
+        for win_start, win_end in zip(cuts[:-1], cuts[1:]):
+            # Wait pads the play to the window's full length
+            window_anims = [Wait(win_end - win_start)]
+
+            # 1. Pipes: the piece of water line drawn during this window
+            for p, (start_t, dur, u, v) in pipe_schedules.items():
+                lo, hi = max(start_t, win_start), min(start_t + dur, win_end)
+                if hi - lo < 1e-9: continue
+                start_pos = net.nodes[u].pos
+                end_pos = net.nodes[v].pos
+                water_line = Line(
+                    start_pos + (end_pos - start_pos) * (lo - start_t) / dur,
+                    start_pos + (end_pos - start_pos) * (hi - start_t) / dur,
+                    stroke_width=p.diameter*20, color=WX_BLUE
+                )
+                anim = Create(water_line, run_time=hi - lo, rate_func=linear)
+                if lo > win_start:
+                    anim = Succession(Wait(lo - win_start), anim)
+                window_anims.append(anim)
+
+            # 2. Nodes reached during this window
+            for nid, t in node_times.items():
+                if not win_start <= t < win_end: continue
                 anim = node_mobjects[net.nodes[nid]].animate.set_color(WX_BLUE).set_run_time(0.2)
-            all_anims.append(anim)
+                if t > win_start:
+                    anim = Succession(Wait(t - win_start), anim)
+                window_anims.append(anim)
 
-        # Play Everything Together
-        self.play(AnimationGroup(*all_anims, lag_ratio=0))
+            self.play(AnimationGroup(*window_anims, lag_ratio=0))
         
         self.wait(1)
         
@@ -194,7 +169,7 @@ class WaterDistributionScene(Scene):
         self.play(FadeIn(legend))
         
 
-        node_labels = create_node_labels(net, node_mobjects)
+        node_labels = create_node_labels(net, node_mobjects) if PROFILE.annotations else {}
         for n, lbl in node_labels.items():
             labels[n] = lbl
 
@@ -231,6 +206,7 @@ class WaterDistributionScene(Scene):
         self.play(*transforms, run_time=2)
         
         fade_outs = [FadeOut(labels[p]) for p in net.pipes if p in labels]
-        self.play(*fade_outs)
+        if fade_outs:
+            self.play(*fade_outs)
         
         self.wait(3)